@@ -0,0 +1,243 @@
+﻿# activity_archive.py
+import gzip
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+SEGMENT_NAME = "activity_log_{month}.jsonl.gz"
+INDEX_NAME = "index.json"
+LOCK_NAME = "index.lock"
+LOCK_TIMEOUT = 60 # seconds to wait for another workstation's archive run to release the lock
+LOCK_STALE_AFTER = 600 # a lock file this old was left by a run that died; it is taken over
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVE_SELECT_SQL = ("SELECT al.id, al.user_id, u.username, al.action, al.record_type, al.record_id, al.description, al.timestamp "
+                      "FROM activity_log al LEFT JOIN users u ON al.user_id = u.id WHERE al.timestamp < %s ORDER BY al.id LIMIT %s")
+
+def validate_archive_directory(directory):
+    """Archived rows are deleted from the shared database, so they must go where every workstation reads them:
+    an existing, writable, absolute path (a network share). Raises ValueError otherwise."""
+    if not directory:
+        raise ValueError("No archive directory is configured. Set [archive] directory in config.ini to a shared "
+                         "folder that every workstation can reach (the same path on each).")
+    if not os.path.isabs(directory):
+        raise ValueError(f"The archive directory must be an absolute path to a shared folder, not {directory!r}.")
+    if not os.path.isdir(directory):
+        raise ValueError(f"The archive directory {directory} does not exist or is not reachable.")
+    if not os.access(directory, os.W_OK):
+        raise ValueError(f"The archive directory {directory} is not writable.")
+
+@contextmanager
+def _directory_lock(directory):
+    """Exclusive lock across workstations: a lock file created with O_EXCL in the shared folder."""
+    path = os.path.join(directory, LOCK_NAME)
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE_AFTER:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue # released meanwhile
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"The activity log archive is locked by another workstation ({path}).")
+            time.sleep(0.5)
+    try:
+        os.write(fd, f"{socket.gethostname()} {os.getpid()}".encode('utf-8'))
+        os.close(fd)
+        yield
+    finally:
+        os.remove(path)
+
+def _month(timestamp):
+    return timestamp.strftime("%Y-%m")
+
+def _matches(entry, filters):
+    for key in ('user_id', 'action', 'record_type', 'record_id'):
+        if filters.get(key) not in (None, '') and entry[key] != filters[key]:
+            return False
+    day = entry['timestamp'].strftime("%Y-%m-%d")
+    if filters.get('date_from') and day < filters['date_from']:
+        return False
+    if filters.get('date_to') and day > filters['date_to']:
+        return False
+    return True
+
+class ActivityArchive:
+    """Archived activity_log rows in monthly, append-only gzip JSONL segments.
+
+    index.json keeps per segment the id and time range, the row count, the maintenance record ids it mentions and
+    the committed byte size, so readers only open the segments a query can reach and never read past a partial append. Rows are read back newest first in the same dict shape
+    as the live activity_log queries. With no directory (archiving not configured) the archive is empty."""
+
+    def __init__(self, directory, cached_segments=2):
+        self.directory = directory
+        self.cached_segments = cached_segments
+        self._index = None
+        self._index_mtime = None
+        self._segments = OrderedDict() # month -> decoded rows, newest first (LRU)
+        self._lock = threading.RLock()
+        self._warned_unreachable = False
+
+    # --- Index ---
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_NAME)
+
+    def _load_index(self, reload=False):
+        """The index as a dict of month -> segment info, re-read if another process archived since."""
+        if self.directory is None:
+            return {}
+        if not os.path.isdir(self.directory):
+            if not self._warned_unreachable:
+                print(f"Warning: activity log archive {self.directory} is not reachable; archived entries are not shown.")
+                self._warned_unreachable = True
+            return {}
+        path = self._index_path()
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if reload or self._index is None or mtime != self._index_mtime:
+            index = {}
+            if mtime is not None:
+                with open(path, encoding='utf-8') as f:
+                    index = json.load(f)
+            self._index, self._index_mtime = index, mtime
+            self._segments.clear()
+        return self._index
+
+    def _save_index(self):
+        path = self._index_path()
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+        self._index_mtime = os.path.getmtime(path)
+
+    def months(self):
+        with self._lock:
+            return sorted(self._load_index())
+
+    # --- Writing ---
+    def append(self, rows):
+        """Append activity_log rows (dicts with datetime timestamps) to their monthly segments."""
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(_month(row['timestamp']), []).append(row)
+        validate_archive_directory(self.directory) # never fall back to a folder other clients cannot see
+        with self._lock, _directory_lock(self.directory):
+            index = self._load_index(reload=True) # another workstation may have archived within the mtime resolution
+            for month, month_rows in by_month.items():
+                path = os.path.join(self.directory, SEGMENT_NAME.format(month=month))
+                info = index.setdefault(month, {'min_id': None, 'max_id': None, 'count': 0, 'record_ids': [], 'size': 0})
+                # Each append adds a new gzip member; gzip readers see the members as one stream.
+                with open(path, 'ab') as raw:
+                    if info.get('size') is not None:
+                        raw.truncate(info['size']) # drop a partial member left by an interrupted append
+                    with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                        for row in month_rows:
+                            entry = dict(row, timestamp=row['timestamp'].strftime(TIMESTAMP_FORMAT))
+                            f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+                    raw.flush()
+                    os.fsync(raw.fileno()) # on disk before the rows are deleted from the database
+                    info['size'] = os.fstat(raw.fileno()).st_size
+                ids = [row['id'] for row in month_rows]
+                info['min_id'] = min(ids + ([info['min_id']] if info['min_id'] is not None else []))
+                info['max_id'] = max(ids + ([info['max_id']] if info['max_id'] is not None else []))
+                info['count'] += len(month_rows)
+                info['record_ids'] = sorted(set(info['record_ids']).union(
+                    row['record_id'] for row in month_rows if row['record_type'] == 'maintenance' and row['record_id']))
+                self._segments.pop(month, None)
+            self._save_index()
+
+    # --- Reading ---
+    def _read_segment(self, month):
+        with self._lock:
+            rows = self._segments.get(month)
+            if rows is not None:
+                self._segments.move_to_end(month)
+                return rows
+            path = os.path.join(self.directory, SEGMENT_NAME.format(month=month))
+            size = self._load_index().get(month, {}).get('size') # None for segments written before sizes were kept
+            by_id = {}
+            try:
+                with open(path, 'rb') as raw:
+                    data = raw.read() if size is None else raw.read(size) # bytes past size are an append in progress
+                with io.TextIOWrapper(gzip.GzipFile(fileobj=io.BytesIO(data)), encoding='utf-8') as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        entry['timestamp'] = datetime.strptime(entry['timestamp'], TIMESTAMP_FORMAT)
+                        by_id[entry['id']] = entry # a batch re-archived after an interrupted run appears twice
+            except (EOFError, ValueError, OSError) as e: # incomplete last append, or missing/unreadable file
+                print(f"Warning: archive segment {path} could not be read completely ({e}); using the rows read so far.")
+            rows = sorted(by_id.values(), key=lambda entry: (entry['timestamp'], entry['id']), reverse=True)
+            self._segments[month] = rows
+            while len(self._segments) > self.cached_segments:
+                self._segments.popitem(last=False)
+            return rows
+
+    def iter_entries(self, filters=None, after=None):
+        """Archived rows matching filters, newest first; after is the (timestamp, id) of the last row already seen."""
+        filters = filters or {}
+        for month in reversed(self.months()):
+            if filters.get('date_to') and month > filters['date_to'][:7]:
+                continue
+            if filters.get('date_from') and month < filters['date_from'][:7]:
+                break
+            if after is not None and month > _month(after[0]):
+                continue
+            for entry in self._read_segment(month):
+                if after is not None and (entry['timestamp'], entry['id']) >= tuple(after):
+                    continue
+                if _matches(entry, filters):
+                    yield entry
+
+    def history_for_record(self, record_id):
+        """Archived log rows of one maintenance record, newest first (only segments that mention it are opened)."""
+        with self._lock:
+            months = [month for month, info in self._load_index().items() if record_id in info['record_ids']]
+        history = []
+        for month in sorted(months, reverse=True):
+            history.extend(entry for entry in self._read_segment(month)
+                           if entry['record_type'] == 'maintenance' and entry['record_id'] == record_id)
+        return history
+
+def archive_activity_log(archive, get_cursor, max_age_days, batch_size=ARCHIVE_BATCH_SIZE, log=None):
+    """Move activity_log rows older than max_age_days into the archive, batch_size rows per transaction.
+    Rows are written to their segment before they are deleted, so an interrupted run loses nothing. Returns the count."""
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime(TIMESTAMP_FORMAT)
+    moved = 0
+    while True:
+        with get_cursor() as cur:
+            cur.execute(ARCHIVE_SELECT_SQL, (cutoff, batch_size))
+            rows = cur.fetchall()
+            if not rows:
+                break
+            archive.append(rows)
+            cur.execute(f"DELETE FROM activity_log WHERE id IN ({', '.join(['%s'] * len(rows))})", [row['id'] for row in rows])
+        moved += len(rows)
+        if log:
+            log(moved)
+        if len(rows) < batch_size:
+            break
+    return moved
+
+if __name__ == "__main__":
+    import db_ops
+    max_age = int(sys.argv[1]) if len(sys.argv) > 1 else db_ops.ARCHIVE_MAX_AGE_DAYS
+    try:
+        validate_archive_directory(db_ops.ARCHIVE_DIRECTORY)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    print(f"Archiving activity log entries older than {max_age} days to {db_ops.ARCHIVE_DIRECTORY}")
+    moved = db_ops.archive_activity_log(max_age, log=lambda count: print(f"\rArchived {count} entries", end="", flush=True))
+    print()
+    print(f"Done: {moved} entries archived.")
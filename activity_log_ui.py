@@ -1,38 +1,221 @@
-﻿# activity_log_ui.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox
-from PyQt5.QtCore import Qt
-import db_ops
-
-class ActivityLogWindow(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("سجل الأنشطة")
-        self.setGeometry(200, 200, 1000, 600)
-        self.setLayoutDirection(Qt.RightToLeft)
-        layout = QVBoxLayout(self)
-        self.refresh_button = QPushButton("تحديث السجل")
-        self.refresh_button.clicked.connect(self.load_log)
-        layout.addWidget(self.refresh_button)
-        self.table = QTableWidget()
-        self.table.verticalHeader().setVisible(False)
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "اسم المستخدم", "الإجراء", "نوع السجل", "معرف السجل", "الوصف", "الوقت والتاريخ"])
-        layout.addWidget(self.table)
-        self.load_log()
-
-    def load_log(self):
-        try:
-            log_entries = db_ops.fetch_activity_log()
-            self.table.setRowCount(len(log_entries))
-            for row_idx, entry in enumerate(log_entries):
-                self.table.setItem(row_idx, 0, QTableWidgetItem(str(entry['id'])))
-                self.table.setItem(row_idx, 1, QTableWidgetItem(entry['username'] or "مستخدم محذوف"))
-                self.table.setItem(row_idx, 2, QTableWidgetItem(entry['action']))
-                self.table.setItem(row_idx, 3, QTableWidgetItem(entry['record_type']))
-                self.table.setItem(row_idx, 4, QTableWidgetItem(str(entry['record_id']) if entry['record_id'] else ""))
-                self.table.setItem(row_idx, 5, QTableWidgetItem(entry['description'] or ""))
-                timestamp_str = entry['timestamp'].strftime("%Y-%m-%d %H:%M:%S") if entry['timestamp'] else ""
-                self.table.setItem(row_idx, 6, QTableWidgetItem(timestamp_str))
-            self.table.resizeColumnsToContents()
-        except Exception as e:
-            QMessageBox.critical(self, "خطأ", f"فشل في تحميل سجل الأنشطة:\n{str(e)}")
\ No newline at end of file
+﻿# activity_log_ui.py
+import csv
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QMessageBox, QLabel, QComboBox, QLineEdit,
+    QDateEdit, QCheckBox, QFileDialog, QStatusBar
+)
+from PyQt5.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QIntValidator
+import db_ops
+from db_worker import DbExecutor
+
+class ActivityLogModel(QAbstractTableModel):
+    """Log entries matching the current filters, fetched one keyset page at a time as the view scrolls."""
+    COLUMNS = [
+        ("id", "ID"), ("username", "اسم المستخدم"), ("action", "الإجراء"), ("record_type", "نوع السجل"),
+        ("record_id", "معرف السجل"), ("description", "الوصف"), ("timestamp", "الوقت والتاريخ")
+    ]
+    page_loaded = pyqtSignal(int) # first row of the page just appended
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, page_size=db_ops.ACTIVITY_LOG_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.filters = {}
+        self.entries = []
+        self._has_more = True
+        self._loading = False
+        self.executor = DbExecutor(self)
+
+    def set_filters(self, filters):
+        self.filters = filters
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.entries = []
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        key = self.COLUMNS[index.column()][0]
+        value = self.entries[index.row()].get(key)
+        if key == "username":
+            return value or "مستخدم محذوف"
+        if key == "timestamp":
+            return value.strftime("%Y-%m-%d %H:%M:%S") if value else ""
+        return str(value) if value else ""
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent):
+        if parent.isValid() or not self._has_more or self._loading:
+            return
+        self._loading = True
+        after = (self.entries[-1]['timestamp'], self.entries[-1]['id']) if self.entries else None
+        self.executor.submit("page", db_ops.fetch_activity_log_page, self.filters, after, self.page_size,
+                             on_result=self._append_page, on_error=self._page_failed)
+
+    def _append_page(self, page):
+        self._loading = False
+        if len(page) < self.page_size:
+            self._has_more = False
+        first_row = len(self.entries)
+        if page:
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(page) - 1)
+            self.entries.extend(page)
+            self.endInsertRows()
+        self.page_loaded.emit(first_row)
+
+    def _page_failed(self, error):
+        self._loading = False
+        self._has_more = False
+        self.load_failed.emit(str(error))
+
+def export_log_csv(filename, filters):
+    """Stream every entry matching filters into a CSV file; returns the number of rows written."""
+    count = 0
+    with open(filename, "w", newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow([label for _, label in ActivityLogModel.COLUMNS])
+        for entry in db_ops.iter_activity_log(filters=filters):
+            writer.writerow([entry['id'], entry['username'] or "مستخدم محذوف", entry['action'], entry['record_type'],
+                             entry['record_id'] or "", entry['description'] or "",
+                             entry['timestamp'].strftime("%Y-%m-%d %H:%M:%S") if entry['timestamp'] else ""])
+            count += 1
+    return count
+
+class ActivityLogWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("سجل الأنشطة")
+        self.setGeometry(200, 200, 1100, 650)
+        self.setLayoutDirection(Qt.RightToLeft)
+        self.executor = DbExecutor(self)
+        layout = QVBoxLayout(self)
+
+        # --- Filter Bar ---
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("المستخدم:"))
+        self.user_combo = QComboBox()
+        self.user_combo.addItem("الجميع", None)
+        filter_layout.addWidget(self.user_combo)
+
+        filter_layout.addWidget(QLabel("الإجراء:"))
+        self.action_combo = QComboBox()
+        self.action_combo.addItem("الجميع", None)
+        for action in db_ops.ACTIVITY_ACTIONS:
+            self.action_combo.addItem(action, action)
+        filter_layout.addWidget(self.action_combo)
+
+        filter_layout.addWidget(QLabel("نوع السجل:"))
+        self.record_type_combo = QComboBox()
+        self.record_type_combo.addItem("الجميع", None)
+        for record_type in db_ops.ACTIVITY_RECORD_TYPES:
+            self.record_type_combo.addItem(record_type, record_type)
+        filter_layout.addWidget(self.record_type_combo)
+
+        filter_layout.addWidget(QLabel("معرف السجل:"))
+        self.record_id_input = QLineEdit()
+        self.record_id_input.setValidator(QIntValidator(1, 2**31 - 1, self))
+        self.record_id_input.setMaximumWidth(90)
+        self.record_id_input.returnPressed.connect(self.load_log)
+        filter_layout.addWidget(self.record_id_input)
+
+        self.date_check = QCheckBox("الفترة من:")
+        filter_layout.addWidget(self.date_check)
+        self.date_from_edit = QDateEdit(calendarPopup=True)
+        self.date_from_edit.setDate(QDate.currentDate().addMonths(-1))
+        filter_layout.addWidget(self.date_from_edit)
+        filter_layout.addWidget(QLabel("إلى:"))
+        self.date_to_edit = QDateEdit(calendarPopup=True)
+        self.date_to_edit.setDate(QDate.currentDate())
+        filter_layout.addWidget(self.date_to_edit)
+        self.date_check.toggled.connect(self.date_from_edit.setEnabled)
+        self.date_check.toggled.connect(self.date_to_edit.setEnabled)
+        self.date_from_edit.setEnabled(False)
+        self.date_to_edit.setEnabled(False)
+        layout.addLayout(filter_layout)
+
+        btn_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("تحديث السجل")
+        self.refresh_button.clicked.connect(self.load_log)
+        btn_layout.addWidget(self.refresh_button)
+        self.export_button = QPushButton("تصدير CSV")
+        self.export_button.clicked.connect(self.export_csv)
+        btn_layout.addWidget(self.export_button)
+        layout.addLayout(btn_layout)
+
+        self.model = ActivityLogModel(parent=self)
+        self.model.page_loaded.connect(self.on_page_loaded)
+        self.model.load_failed.connect(lambda error: QMessageBox.critical(self, "خطأ", f"فشل في تحميل سجل الأنشطة:\n{error}"))
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.status_bar = QStatusBar()
+        layout.addWidget(self.status_bar)
+
+        self.executor.submit("users", db_ops.fetch_all_users, on_result=self.fill_users)
+        self.load_log()
+
+    def fill_users(self, users):
+        for user in users:
+            self.user_combo.addItem(user['username'], user['id'])
+
+    def current_filters(self):
+        filters = {
+            'user_id': self.user_combo.currentData(),
+            'action': self.action_combo.currentData(),
+            'record_type': self.record_type_combo.currentData(),
+            'record_id': int(self.record_id_input.text()) if self.record_id_input.text() else None,
+        }
+        if self.date_check.isChecked():
+            filters['date_from'] = self.date_from_edit.date().toString("yyyy-MM-dd")
+            filters['date_to'] = self.date_to_edit.date().toString("yyyy-MM-dd")
+        return filters
+
+    def load_log(self):
+        self.model.set_filters(self.current_filters())
+
+    def on_page_loaded(self, first_row):
+        if first_row == 0:
+            self.table.resizeColumnsToContents()
+        self.status_bar.showMessage(f"عدد السجلات المعروضة: {self.model.rowCount()}")
+
+    def export_csv(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "تصدير سجل الأنشطة", "activity_log.csv", "CSV Files (*.csv)")
+        if not filename:
+            return
+        self.export_button.setDisabled(True)
+        self.status_bar.showMessage("جاري التصدير...")
+        self.executor.submit("export", export_log_csv, filename, self.current_filters(),
+                             on_result=self.export_finished, on_error=self.export_failed)
+
+    def export_finished(self, count):
+        self.export_button.setDisabled(False)
+        self.status_bar.showMessage(f"تم تصدير {count} سجل.", 5000)
+
+    def export_failed(self, error):
+        self.export_button.setDisabled(False)
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, "خطأ", f"فشل في تصدير سجل الأنشطة:\n{str(error)}")
@@ -0,0 +1,167 @@
+﻿# attachment_ingest.py
+import os
+import threading
+import time
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import attachment_store
+import db_ops
+
+INGEST_WORKERS = 4 # files copied at once; more mostly adds seeking on local disks and contention on shares
+PROGRESS_INTERVAL = 0.1 # seconds between progress signals of one batch; a finished file is always reported
+
+_ingest_pool = None
+
+def ingest_pool():
+    global _ingest_pool
+    if _ingest_pool is None:
+        _ingest_pool = QThreadPool()
+        _ingest_pool.setMaxThreadCount(INGEST_WORKERS)
+    return _ingest_pool
+
+class _Batch:
+    """Files of one ingest run. Shared by the copy tasks; every field is guarded by lock."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.files = [] # (maintenance_id, source_path, size)
+        self.stored = {} # index -> (content_hash, stored_filepath)
+        self.failures = [] # (original filename, error message)
+        self.pending = 0
+        self.done = 0
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.last_progress = 0.0 # time.monotonic() of the last progress signal
+        self.closed = False # the last task is committing; new files start a new batch
+
+class _CopyTask(QRunnable):
+    def __init__(self, ingest, batch, index):
+        super().__init__()
+        self.ingest = ingest
+        self.batch = batch
+        self.index = index
+
+    def run(self):
+        batch = self.batch
+        maintenance_id, source_path, _ = batch.files[self.index]
+        name = os.path.basename(source_path)
+        self.ingest._emit_progress(batch, name)
+        result, error = None, None
+        try:
+            result = attachment_store.ingest(source_path, os.path.splitext(name)[1],
+                                             on_chunk=lambda count: self.ingest._add_bytes(batch, name, count),
+                                             cancelled=batch.cancel_event.is_set)
+        except Exception as e:
+            error = str(e)
+        with batch.lock:
+            if result:
+                batch.stored[self.index] = result
+            elif error:
+                batch.failures.append((name, error))
+            batch.done += 1
+            batch.pending -= 1
+            last = batch.pending == 0
+            if last:
+                batch.closed = True
+        self.ingest._emit_progress(batch, name, force=True)
+        if last:
+            # Committed from the worker, so the rows are written even if the window closes meanwhile.
+            self.ingest._finish(batch)
+
+class AttachmentIngest(QObject):
+    """Copies attachment files into attachment_store on a bounded thread pool, hashing as they are copied,
+    then inserts all their attachments rows in one transaction. Files added while a run is in progress join it.
+    cancel() stops the copies and removes whatever was already stored for the run."""
+    progress = pyqtSignal(str, int, int, float) # current file name, files done, files total, fraction of bytes copied
+    # rows added, [(file name, error)], cancelled, record ids, and the error that stopped the rows from being
+    # committed or the copies from being removed ('' if none)
+    finished = pyqtSignal(int, object, bool, object, str)
+
+    def __init__(self, user_id, parent=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def is_running(self):
+        with self._lock:
+            return self._batch is not None
+
+    def add(self, maintenance_id, paths):
+        files = []
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0 # the copy task reports the error
+            files.append((maintenance_id, path, size))
+        if not files:
+            return
+        with self._lock:
+            batch = self._batch
+            if batch is not None:
+                with batch.lock:
+                    if batch.closed or batch.cancel_event.is_set():
+                        batch = None
+                    else:
+                        first = len(batch.files)
+                        batch.files.extend(files)
+                        batch.pending += len(files)
+                        batch.bytes_total += sum(size for _, _, size in files)
+            if batch is None:
+                batch = self._batch = _Batch()
+                first = 0
+                batch.files = files
+                batch.pending = len(files)
+                batch.bytes_total = sum(size for _, _, size in files)
+        for index in range(first, first + len(files)):
+            ingest_pool().start(_CopyTask(self, batch, index))
+
+    def cancel(self):
+        with self._lock:
+            if self._batch is not None:
+                self._batch.cancel_event.set()
+
+    def _add_bytes(self, batch, name, count):
+        with batch.lock:
+            batch.bytes_done += count
+        self._emit_progress(batch, name)
+
+    def _emit_progress(self, batch, name, force=False):
+        with batch.lock:
+            now = time.monotonic()
+            if not force and now - batch.last_progress < PROGRESS_INTERVAL:
+                return
+            batch.last_progress = now
+            args = (name, batch.done, len(batch.files), batch.bytes_done / batch.bytes_total if batch.bytes_total else 0.0)
+        self._emit(self.progress, *args)
+
+    def _finish(self, batch):
+        cancelled = batch.cancel_event.is_set()
+        stored = [(*batch.files[index][:2], os.path.basename(batch.files[index][1]), *batch.stored[index])
+                  for index in sorted(batch.stored)]
+        added, errors = 0, []
+        release = cancelled
+        if stored and not cancelled:
+            try:
+                added = len(db_ops.add_attachments_many(stored, self.user_id))
+            except Exception as e:
+                errors.append(f"Saving the attachments failed: {e}")
+                release = True
+        if stored and release:
+            try:
+                db_ops.release_attachment_files([(content_hash, path) for *_, content_hash, path in stored])
+            except Exception as e:
+                print(f"Error removing copies of an attachment ingest: {e}")
+                errors.append(f"Removing the copied files failed: {e}")
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+        self._emit(self.finished, added, batch.failures, cancelled,
+                   sorted({maintenance_id for maintenance_id, _, _ in batch.files}), "\n".join(errors))
+
+    def _emit(self, signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass # the window was closed; the files are still committed
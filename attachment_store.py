@@ -0,0 +1,75 @@
+﻿# attachment_store.py
+import hashlib
+import os
+import shutil
+import uuid
+
+ATTACHMENT_DIR = "attachments_storage"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """SHA-256 hex digest of a file, read in chunks so large files never sit in memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def path_for(content_hash, extension, root=ATTACHMENT_DIR):
+    """Where a file with this hash lives: two levels of two-hex-digit shards keep every directory small,
+    e.g. attachments_storage/3f/a2/3fa2...e9.pdf. The extension is kept so previews and "open" still work."""
+    return os.path.join(root, content_hash[:2], content_hash[2:4], content_hash + extension.lower())
+
+def put(source_path, content_hash, extension, root=ATTACHMENT_DIR):
+    """Copy source_path into the store unless its content is already there; returns the stored path."""
+    target = path_for(content_hash, extension, root)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Copy under a temporary name and rename, so a crash never leaves a partial file under the final name.
+        temp = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(source_path, temp)
+            os.replace(temp, target)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+    return target
+
+def ingest(source_path, extension, root=ATTACHMENT_DIR, on_chunk=None, cancelled=None, chunk_size=HASH_CHUNK_SIZE):
+    """Copy source_path into the store in a single read, hashing while it copies (one pass matters for files on
+    network shares). on_chunk(byte_count) reports progress; returns (content_hash, stored_path), or None once
+    cancelled() turns true."""
+    os.makedirs(root, exist_ok=True)
+    temp = os.path.join(root, f"{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(source_path, 'rb') as source, open(temp, 'wb') as target_file:
+            for chunk in iter(lambda: source.read(chunk_size), b''):
+                if cancelled and cancelled():
+                    return None
+                digest.update(chunk)
+                target_file.write(chunk)
+                if on_chunk:
+                    on_chunk(len(chunk))
+        content_hash = digest.hexdigest()
+        target = path_for(content_hash, extension, root)
+        if not os.path.exists(target): # otherwise the content is already stored and the copy is dropped
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(temp, target)
+        return content_hash, target
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+def remove(stored_path):
+    """Delete a stored file that is no longer referenced, and its shard directories once they are empty."""
+    if os.path.exists(stored_path):
+        os.remove(stored_path)
+    root = os.path.abspath(ATTACHMENT_DIR)
+    directory = os.path.dirname(os.path.abspath(stored_path))
+    while directory.startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break # not empty
+        directory = os.path.dirname(directory)
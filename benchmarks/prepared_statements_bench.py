@@ -0,0 +1,112 @@
+﻿# benchmarks/prepared_statements_bench.py
+"""Per-call latency of the hot db_ops statements run as plain text queries vs. cached server-side prepared
+statements (db_ops.get_cursor(prepared=True)). Needs the MySQL server from config.ini; prints JSON.
+
+    python benchmarks/prepared_statements_bench.py [--calls 2000] [--output prepared.json]
+
+Every case runs on one pooled connection inside a transaction that is rolled back, so the logging case
+leaves no rows behind."""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_ops
+import db_pool
+
+PAGE_SIZE = 200 # entry_ui.RECORDS_PAGE_SIZE; not imported to keep PyQt out of the benchmark
+HISTORY_SQL = ("SELECT u.username, al.action, al.description, al.timestamp FROM activity_log al LEFT JOIN users u "
+               "ON al.user_id = u.id WHERE al.record_type = 'maintenance' AND al.record_id = %s ORDER BY al.timestamp DESC")
+
+def build_cases(record_ids, user_id):
+    """(name, sql, params(i)) for the selection and logging paths hit on every click in EntryWindow."""
+    def record_id(i):
+        return record_ids[i % len(record_ids)]
+    return [
+        ("fetch_records_page", f"SELECT {db_ops.LIST_COLUMNS} FROM maintenance WHERE is_deleted = 0 AND id < %s ORDER BY id DESC LIMIT %s",
+         lambda i: (record_id(i), PAGE_SIZE)),
+        ("get_record", "SELECT * FROM maintenance WHERE id = %s", lambda i: (record_id(i),)),
+        ("get_attachments_for_record", "SELECT id, original_filename, stored_filepath FROM attachments WHERE maintenance_id = %s ORDER BY id",
+         lambda i: (record_id(i),)),
+        ("get_history_for_record", HISTORY_SQL, lambda i: (record_id(i),)),
+        ("get_record_bundle", db_ops.RECORD_BUNDLE_SQL, lambda i: (record_id(i),)),
+        ("get_records_count_in_period", "SELECT CAST(COALESCE(SUM(record_count), 0) AS SIGNED) AS count FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s",
+         lambda i: ("2000-01-01", "2100-12-31")),
+        ("log_activity", db_ops.ACTIVITY_LOG_INSERT_SQL + db_ops.ACTIVITY_LOG_ROW,
+         lambda i: (user_id, "UPDATE", "maintenance", record_id(i), "prepared statement benchmark")),
+    ]
+
+def time_calls(cur, sql, params, calls):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        cur.execute(sql, params(i))
+        if cur.description:
+            cur.fetchall()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1] * 1e6, 1),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+    }
+
+class _TextCursor:
+    """Plain dict cursor with the same execute/fetchall/description surface as the prepared one."""
+    def __init__(self, conn):
+        self._cur = conn.cursor(dictionary=True)
+
+    def execute(self, sql, params):
+        self._cur.execute(sql, params)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    @property
+    def description(self):
+        return self._cur.description
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="calls per statement and mode")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    conn = db_ops.pool.get_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id FROM maintenance WHERE is_deleted = 0 ORDER BY id DESC LIMIT 100")
+        record_ids = [row["id"] for row in cur.fetchall()] or [0]
+        cur.execute("SELECT id FROM users WHERE is_deleted = 0 ORDER BY id LIMIT 1")
+        user = cur.fetchone()
+        cur.close()
+        conn.rollback()
+
+        report = {"calls": args.calls, "server": conn.get_server_info(), "cases": {}}
+        for name, sql, params in build_cases(record_ids, user["id"] if user else None):
+            results = {}
+            for mode, cursor in (("text", _TextCursor(conn)), ("prepared", db_pool.PreparedCursor(conn))):
+                time_calls(cursor, sql, params, args.warmup)
+                results[mode] = summarize(time_calls(cursor, sql, params, args.calls))
+                conn.rollback()
+            results["median_speedup"] = round(results["text"]["median_us"] / results["prepared"]["median_us"], 2)
+            report["cases"][name] = results
+    finally:
+        conn.rollback()
+        conn.close()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
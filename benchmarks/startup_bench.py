@@ -0,0 +1,232 @@
+﻿# benchmarks/startup_bench.py
+"""Startup benchmark: import cost per project module, time to LoginWindow.show(), and time from login to
+SelectionWindow and to a populated EntryWindow. Runs headless against an in-memory SQLite stand-in for MySQL
+and prints JSON.
+
+    python benchmarks/startup_bench.py [--runs 5] [--records 5000] [--output startup.json]
+
+"cold" runs compile every module from source (empty bytecode cache); "warm" runs reuse a primed cache."""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MILESTONES = ("imports_done", "login_shown", "selection_shown", "entry_populated")
+TOP_PACKAGES = 15 # non-project packages listed in the report, by self time
+
+# --- SQLite stand-in for db_ops.get_cursor ---
+# Only the MySQL syntax used on the startup path is translated.
+_SQL_REWRITES = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bIF\("), "IIF("),
+    (re.compile(r"\bLEFT\("), "LEFT_STR("),
+    (re.compile(r"\bCHAR_LENGTH\("), "LENGTH("),
+    (re.compile(r"\s+FOR UPDATE\b"), ""),
+]
+
+SCHEMA = """
+CREATE TABLE roles (id INTEGER PRIMARY KEY, role_name TEXT NOT NULL);
+CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, password_hash TEXT, role_id INTEGER,
+                    department TEXT, is_deleted INTEGER DEFAULT 0);
+CREATE TABLE departments (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE maintenance (id INTEGER PRIMARY KEY, date TEXT, type TEXT, device TEXT, technician TEXT,
+                          procedures TEXT, materials TEXT, notes TEXT, warnings TEXT, department TEXT,
+                          is_deleted INTEGER DEFAULT 0);
+"""
+DEPARTMENTS = ["الصيانة", "الشبكات", "الحاسبات", "الكهرباء"]
+
+def _translate(sql):
+    for pattern, replacement in _SQL_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+class _DictCursor:
+    def __init__(self, cur):
+        self._cur = cur
+
+    def execute(self, sql, params=()):
+        self._cur.execute(_translate(sql), tuple(params))
+
+    def _row(self, row):
+        return None if row is None else {col[0]: value for col, value in zip(self._cur.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cur.fetchall()]
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name) # lastrowid, rowcount, close
+
+def make_standin(record_count):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.create_function("LEFT_STR", 2, lambda text, n: None if text is None else text[:n], deterministic=True)
+    conn.create_function("CONCAT", -1, lambda *parts: None if None in parts else "".join(map(str, parts)), deterministic=True)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO roles (id, role_name) VALUES (?, ?)", [(1, "admin"), (2, "user")])
+    conn.execute("INSERT INTO users (username, password_hash, role_id, department) VALUES ('bench', 'bench', 1, NULL)")
+    conn.executemany("INSERT INTO departments (name) VALUES (?)", [(name,) for name in DEPARTMENTS])
+    long_text = "تم فحص الجهاز واستبدال القطع التالفة وإعادة التشغيل والتأكد من سلامة التوصيلات. " * 4
+    conn.executemany(
+        "INSERT INTO maintenance (date, type, device, technician, procedures, materials, notes, warnings, department) "
+        "VALUES (date('now', ?), ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((f"-{i % 300} days", "دورية" if i % 3 else "طارئة", f"جهاز {i}", f"فني {i % 12}", long_text, "مواد",
+          long_text if i % 2 else None, "", DEPARTMENTS[i % len(DEPARTMENTS)]) for i in range(record_count)))
+    conn.commit()
+
+    @contextmanager
+    def get_cursor(prepared=False): # prepared statements are a server feature; SQLite just runs the text
+        cur = _DictCursor(conn.cursor())
+        try:
+            yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+    return get_cursor
+
+# --- Child: one measured application start ---
+def run_child(record_count):
+    start = float(os.environ["STARTUP_BENCH_T0"])
+    marks = {}
+    def mark(name):
+        marks[name] = round(time.time() - start, 4)
+
+    sys.path.insert(0, REPO_DIR)
+    # Same imports as main.py, in the same order.
+    from PyQt5.QtWidgets import QApplication
+    from login_ui import LoginWindow
+    from stylesheet import STYLE_SHEET
+    mark("imports_done")
+
+    import db_ops
+    db_ops.get_cursor = make_standin(record_count)
+
+    app = QApplication(sys.argv)
+    app.setStyleSheet(STYLE_SHEET)
+    login = LoginWindow()
+    login.show()
+    app.processEvents()
+    mark("login_shown")
+
+    clicked = time.time()
+    login.username_input.setText("bench")
+    login.password_input.setText("bench")
+    login.login()
+    selection = login.selection_window
+    app.processEvents()
+    marks["login_to_selection"] = round(time.time() - clicked, 4)
+    mark("selection_shown")
+
+    clicked = time.time()
+    selection.open_entry()
+    entry = selection.entry_window
+    deadline = time.time() + 30
+    while entry.records_model.rowCount() == 0 and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    marks["selection_to_entry"] = round(time.time() - clicked, 4)
+    mark("entry_populated")
+    marks["entry_rows"] = entry.records_model.rowCount()
+    print(json.dumps(marks))
+
+# --- Parent: import-time aggregation and run orchestration ---
+def project_modules():
+    names = set()
+    for entry in os.listdir(REPO_DIR):
+        path = os.path.join(REPO_DIR, entry)
+        if entry.endswith(".py"):
+            names.add(entry[:-3])
+        elif os.path.isfile(os.path.join(path, "__init__.py")):
+            names.add(entry)
+    return names
+
+def parse_importtime(stderr, project):
+    """Aggregate -X importtime output: self/cumulative microseconds per project module and self time per top-level package."""
+    modules = {}
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        top = name.split(".")[0]
+        if top in project:
+            entry = modules.setdefault(name, {"self_us": 0, "cumulative_us": 0})
+            entry["self_us"] += int(self_us)
+            entry["cumulative_us"] += int(cumulative_us)
+        else:
+            packages[top] = packages.get(top, 0) + int(self_us)
+    return modules, packages
+
+def run_once(record_count, pycache_dir):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPYCACHEPREFIX=pycache_dir)
+    env["STARTUP_BENCH_T0"] = repr(time.time())
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child",
+                           "--records", str(record_count)],
+                          env=env, cwd=REPO_DIR, capture_output=True, text=True, encoding="utf-8")
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"benchmark child failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1]), proc.stderr
+
+def summarize(samples, project):
+    timings = {key: round(statistics.median(marks[key] for marks, _ in samples), 4)
+               for key in MILESTONES + ("login_to_selection", "selection_to_entry")}
+    per_run = [parse_importtime(stderr, project) for _, stderr in samples]
+    modules = {}
+    for name in set().union(*(run_modules for run_modules, _ in per_run)):
+        values = [run_modules.get(name, {"self_us": 0, "cumulative_us": 0}) for run_modules, _ in per_run]
+        modules[name] = {key: int(statistics.median(value[key] for value in values)) for key in ("self_us", "cumulative_us")}
+    packages = {}
+    for name in set().union(*(run_packages for _, run_packages in per_run)):
+        packages[name] = int(statistics.median(run_packages.get(name, 0) for _, run_packages in per_run))
+    top_packages = dict(sorted(packages.items(), key=lambda item: -item[1])[:TOP_PACKAGES])
+    return {
+        "timings_s": timings,
+        "project_modules_us": dict(sorted(modules.items(), key=lambda item: -item[1]["cumulative_us"])),
+        "other_packages_self_us": top_packages, # stdlib and third-party, including this script's own imports
+        "entry_rows": samples[-1][0]["entry_rows"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.records)
+        return
+
+    project = project_modules()
+    report = {"python": sys.version.split()[0], "runs": args.runs, "records": args.records}
+    with tempfile.TemporaryDirectory() as tmp:
+        cold = [run_once(args.records, os.path.join(tmp, f"cold{i}")) for i in range(args.runs)]
+        warm_cache = os.path.join(tmp, "warm")
+        run_once(args.records, warm_cache) # prime the bytecode cache
+        warm = [run_once(args.records, warm_cache) for _ in range(args.runs)]
+    report["cold"] = summarize(cold, project)
+    report["warm"] = summarize(warm, project)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
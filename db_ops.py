@@ -1,427 +1,1330 @@
-﻿# db_ops.py
-import mysql.connector
-from mysql.connector import pooling
-from contextlib import contextmanager
-import subprocess
-import os
-from datetime import datetime
-import configparser
-import sys # <-- ADDED IMPORT
-
-def get_base_path():
-    """ Get the correct base path whether running as a script or a frozen exe."""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    else:
-        return os.path.dirname(os.path.abspath(__file__))
-
-# --- New Debugging Code ---
-config = configparser.ConfigParser()
-config_path = os.path.join(get_base_path(), 'config.ini')
-
-# --- TEMPORARY DEBUGGING CODE ---
-# This will print the path to the console so we can see it.
-print(f"DEBUG: Looking for config file at: {config_path}")
-if not os.path.exists(config_path):
-    print("DEBUG: ERROR - config.ini does NOT exist at this path!")
-else:
-    print("DEBUG: SUCCESS - config.ini found!")
-# --- END DEBUGGING CODE ---
-
-config.read(config_path)
-
-DB_CONFIG = dict(
-    host=config.get('database', 'host'),
-    user=config.get('database', 'user'),
-    password=config.get('database', 'password'),
-    database=config.get('database', 'database'),
-    charset=config.get('database', 'charset'),
-    collation=config.get('database', 'collation')
-)
-
-# --- Create a Connection Pool for Stability ---
-try:
-    pool = pooling.MySQLConnectionPool(pool_name="mypool",
-                                       pool_size=5,
-                                       **DB_CONFIG)
-except mysql.connector.Error as err:
-    print(f"Error creating connection pool: {err}")
-    pool = None
-
-@contextmanager
-def get_cursor():
-    if not pool:
-        raise Exception("Database connection pool is not available.")
-    conn = pool.get_connection()
-    cur = conn.cursor(dictionary=True)
-    try:
-        yield cur
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        cur.close()
-        conn.close()
-
-# --- BACKUP & RESTORE ---
-def backup_database(output_path):
-    try:
-        cmd = ["mysqldump", f"--host={DB_CONFIG['host']}", f"--user={DB_CONFIG['user']}", f"--password={DB_CONFIG['password']}", "--single-transaction", "--routines", "--triggers", DB_CONFIG['database']]
-        with open(output_path, 'w', encoding='utf-8') as f:
-            result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, text=True)
-        if result.returncode == 0:
-            return True, f"تم إنشاء النسخة الاحتياطية بنجاح في:\n{output_path}"
-        else:
-            return False, f"فشل النسخ الاحتياطي:\n{result.stderr.strip()}"
-    except Exception as e:
-        return False, f"حدث استثناء أثناء النسخ الاحتياطي:\n{str(e)}"
-
-def restore_database(input_path):
-    try:
-        if not os.path.exists(input_path):
-            return False, f"ملف النسخة الاحتياطية غير موجود: {input_path}"
-        cmd = ["mysql", f"--host={DB_CONFIG['host']}", f"--user={DB_CONFIG['user']}", f"--password={DB_CONFIG['password']}", DB_CONFIG['database']]
-        with open(input_path, 'r', encoding='utf-8') as f:
-            result = subprocess.run(cmd, stdin=f, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode == 0:
-            return True, "تمت استعادة النسخة الاحتياطية بنجاح."
-        else:
-            return False, f"فشل استعادة النسخة الاحتياطية:\n{result.stderr.strip()}"
-    except Exception as e:
-        return False, f"حدث استثناء أثناء استعادة النسخة الاحتياطية:\n{str(e)}"
-
-# --- ACTIVITY LOG ---
-def log_activity(user_id, action, record_type, record_id=None, description=None):
-    sql = "INSERT INTO activity_log (user_id, action, record_type, record_id, description) VALUES (%s, %s, %s, %s, %s)"
-    with get_cursor() as cur:
-        cur.execute(sql, (user_id, action, record_type, record_id, description or ""))
-
-def fetch_activity_log(limit=100):
-    sql = "SELECT al.id, u.username, al.action, al.record_type, al.record_id, al.description, al.timestamp FROM activity_log al LEFT JOIN users u ON al.user_id = u.id ORDER BY al.timestamp DESC LIMIT %s"
-    with get_cursor() as cur:
-        cur.execute(sql, (limit,))
-        return cur.fetchall()
-
-# --- CRUD maintenance ---
-def insert_record(data, user_id):
-    sql = "INSERT INTO maintenance (date, type, device, technician, procedures, materials, notes, warnings, department) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
-    with get_cursor() as cur:
-        cur.execute(sql, data)
-        new_record_id = cur.lastrowid
-        log_activity(user_id, 'INSERT', 'maintenance', new_record_id, f"Added record for device: {data[2]}")
-        return new_record_id
-
-def fetch_records(department=None):
-    with get_cursor() as cur:
-        sql = "SELECT * FROM maintenance WHERE is_deleted = 0"
-        params = []
-        if department:
-            sql += " AND department = %s"
-            params.append(department)
-        sql += " ORDER BY id DESC"
-        cur.execute(sql, params)
-        return cur.fetchall()
-
-def update_record(rec_id, data, user_id):
-    sql = "UPDATE maintenance SET date=%s, type=%s, device=%s, technician=%s, procedures=%s, materials=%s, notes=%s, warnings=%s, department=%s WHERE id=%s"
-    with get_cursor() as cur:
-        cur.execute(sql, (*data, rec_id))
-        if cur.rowcount > 0:
-            log_activity(user_id, 'UPDATE', 'maintenance', rec_id, f"Updated record for device: {data[2]}")
-
-def delete_record(rec_id, user_id):
-    with get_cursor() as cur:
-        sql = "UPDATE maintenance SET is_deleted = 1 WHERE id = %s"
-        cur.execute(sql, (rec_id,))
-        if cur.rowcount > 0:
-            log_activity(user_id, 'TRASH', 'maintenance', rec_id, f"Moved record to trash ID: {rec_id}")
-
-# --- TRASH MANAGEMENT (Maintenance Records) ---
-def fetch_deleted_records():
-    with get_cursor() as cur:
-        sql = "SELECT * FROM maintenance WHERE is_deleted = 1 ORDER BY id DESC"
-        cur.execute(sql)
-        return cur.fetchall()
-
-def restore_record(rec_id, user_id):
-    with get_cursor() as cur:
-        sql = "UPDATE maintenance SET is_deleted = 0 WHERE id = %s"
-        cur.execute(sql, (rec_id,))
-        if cur.rowcount > 0:
-            log_activity(user_id, 'RESTORE', 'maintenance', rec_id, f"Restored record from trash ID: {rec_id}")
-
-def permanently_delete_record(rec_id, user_id):
-    with get_cursor() as cur:
-        cur.execute("DELETE FROM maintenance WHERE id=%s AND is_deleted = 1", (rec_id,))
-        if cur.rowcount > 0:
-            log_activity(user_id, 'DELETE', 'maintenance', rec_id, f"Permanently deleted record ID: {rec_id}")
-
-# --- AUTH & USER MANAGEMENT ---
-def verify_user(username, password):
-    with get_cursor() as cur:
-        cur.execute("SELECT id, role_id, department FROM users WHERE username=%s AND password_hash=%s AND is_deleted = 0", (username, password))
-        return cur.fetchone()
-
-def get_role_name_by_id(role_id):
-    with get_cursor() as cur:
-        cur.execute("SELECT role_name FROM roles WHERE id=%s", (role_id,))
-        row = cur.fetchone()
-        return row['role_name'] if row else None
-
-def add_user(username, password, role_name, department, current_user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("SELECT id FROM roles WHERE role_name = %s", (role_name,))
-            role = cur.fetchone()
-            if not role: return False, "دور المستخدم غير موجود"
-            role_id = role['id']
-            cur.execute("SELECT id FROM users WHERE username=%s", (username,))
-            if cur.fetchone(): return False, "اسم المستخدم موجود بالفعل"
-            cur.execute("INSERT INTO users (username, password_hash, role_id, department) VALUES (%s, %s, %s, %s)", (username, password, role_id, department))
-            new_user_id = cur.lastrowid
-            log_activity(current_user_id, 'INSERT', 'user', new_user_id, f"Added user: {username} with role: {role_name}")
-        return True, "تمت الإضافة بنجاح"
-    except Exception as e:
-        return False, str(e)
-
-def update_user(user_id, role_name, department, new_password, current_user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("SELECT id FROM roles WHERE role_name = %s", (role_name,))
-            role = cur.fetchone()
-            if not role: return False, "الدور المحدد غير صالح."
-            role_id = role['id']
-            if new_password:
-                sql = "UPDATE users SET role_id=%s, department=%s, password_hash=%s WHERE id=%s"
-                params = (role_id, department, new_password, user_id)
-                log_description = f"Updated user ID {user_id} (department, role, password)"
-            else:
-                sql = "UPDATE users SET role_id=%s, department=%s WHERE id=%s"
-                params = (role_id, department, user_id)
-                log_description = f"Updated user ID {user_id} (department, role)"
-            cur.execute(sql, params)
-            log_activity(current_user_id, 'UPDATE', 'user', user_id, log_description)
-        return True, "تم تحديث المستخدم بنجاح."
-    except Exception as e:
-        return False, f"فشل تحديث المستخدم: {str(e)}"
-
-def delete_user(user_id_to_delete, current_user_id):
-    if user_id_to_delete == current_user_id:
-        return False, "لا يمكنك حذف حسابك الخاص."
-    try:
-        with get_cursor() as cur:
-            cur.execute("UPDATE users SET is_deleted = 1 WHERE id = %s", (user_id_to_delete,))
-            if cur.rowcount > 0:
-                log_activity(current_user_id, 'TRASH', 'user', user_id_to_delete, f"Moved user to trash ID: {user_id_to_delete}")
-                return True, "تم نقل المستخدم إلى سلة المحذوفات."
-            else:
-                return False, "لم يتم العثور على المستخدم."
-    except Exception as e:
-        return False, f"فشل حذف المستخدم: {str(e)}"
-
-# --- TRASH MANAGEMENT (Users) ---
-def fetch_deleted_users():
-    sql = "SELECT u.id, u.username, r.role_name, u.department FROM users u JOIN roles r ON u.role_id = r.id WHERE u.is_deleted = 1 ORDER BY u.id"
-    with get_cursor() as cur:
-        cur.execute(sql)
-        return cur.fetchall()
-
-def restore_user(user_id, admin_id):
-    with get_cursor() as cur:
-        cur.execute("UPDATE users SET is_deleted = 0 WHERE id = %s", (user_id,))
-        if cur.rowcount > 0:
-            log_activity(admin_id, 'RESTORE', 'user', user_id, f"Restored user from trash ID: {user_id}")
-
-def permanently_delete_user(user_id, admin_id):
-    with get_cursor() as cur:
-        cur.execute("DELETE FROM users WHERE id = %s AND is_deleted = 1", (user_id,))
-        if cur.rowcount > 0:
-            log_activity(admin_id, 'DELETE', 'user', user_id, f"Permanently deleted user ID: {user_id}")
-
-# --- ADMIN DASHBOARD HELPERS ---
-def fetch_all_users():
-    sql = "SELECT u.id, u.username, r.role_name, u.department FROM users u JOIN roles r ON u.role_id = r.id WHERE u.is_deleted = 0 ORDER BY u.id"
-    with get_cursor() as cur:
-        cur.execute(sql)
-        return cur.fetchall()
-
-def get_total_record_count():
-    with get_cursor() as cur:
-        cur.execute("SELECT COUNT(*) AS count FROM maintenance WHERE is_deleted = 0")
-        result = cur.fetchone()
-        return result['count'] if result else 0
-
-def get_total_user_count():
-    with get_cursor() as cur:
-        cur.execute("SELECT COUNT(*) AS count FROM users WHERE is_deleted = 0")
-        result = cur.fetchone()
-        return result['count'] if result else 0
-
-def get_user_role_count(role_name):
-    with get_cursor() as cur:
-        cur.execute("SELECT COUNT(*) AS count FROM users u JOIN roles r ON u.role_id = r.id WHERE r.role_name = %s AND u.is_deleted = 0", (role_name,))
-        result = cur.fetchone()
-        return result['count'] if result else 0
-
-# --- DEPARTMENT MANAGEMENT ---
-def get_all_departments():
-    with get_cursor() as cur:
-        cur.execute("SELECT name FROM departments ORDER BY name")
-        return [row['name'] for row in cur.fetchall()]
-
-def add_department(name, user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("INSERT INTO departments (name) VALUES (%s)", (name,))
-            new_dept_id = cur.lastrowid
-            log_activity(user_id, 'INSERT', 'department', new_dept_id, f"Added department: {name}")
-            return True, "تمت إضافة القسم بنجاح."
-    except mysql.connector.Error as err:
-        if err.errno == 1062: return False, "هذا القسم موجود بالفعل."
-        return False, str(err)
-
-def update_department(department_id, new_name, user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("UPDATE departments SET name = %s WHERE id = %s", (new_name, department_id))
-            log_activity(user_id, 'UPDATE', 'department', department_id, f"Renamed department to: {new_name}")
-            return True, "تم تحديث القسم بنجاح."
-    except mysql.connector.Error as err:
-        if err.errno == 1062: return False, "اسم القسم هذا مستخدم بالفعل."
-        return False, str(err)
-
-def delete_department(department_id, user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("SELECT name FROM departments WHERE id = %s", (department_id,))
-            dept_name = cur.fetchone()['name']
-            cur.execute("SELECT COUNT(*) as count FROM users WHERE department = %s AND is_deleted = 0", (dept_name,))
-            if cur.fetchone()['count'] > 0: return False, "لا يمكن حذف القسم لأنه معين لمستخدمين حاليين."
-            cur.execute("SELECT COUNT(*) as count FROM maintenance WHERE department = %s AND is_deleted = 0", (dept_name,))
-            if cur.fetchone()['count'] > 0: return False, "لا يمكن حذف القسم لأنه مستخدم في سجلات الصيانة."
-            cur.execute("DELETE FROM departments WHERE id = %s", (department_id,))
-            log_activity(user_id, 'DELETE', 'department', department_id, f"Deleted department: {dept_name}")
-            return True, "تم حذف القسم بنجاح."
-    except Exception as e:
-        return False, str(e)
-
-def get_department_id_by_name(name):
-    with get_cursor() as cur:
-        cur.execute("SELECT id FROM departments WHERE name = %s", (name,))
-        result = cur.fetchone()
-        return result['id'] if result else None
-
-# --- ATTACHMENT MANAGEMENT ---
-def add_attachment(maintenance_id, original_filename, stored_filepath, user_id):
-    with get_cursor() as cur:
-        sql = "INSERT INTO attachments (maintenance_id, original_filename, stored_filepath) VALUES (%s, %s, %s)"
-        cur.execute(sql, (maintenance_id, original_filename, stored_filepath))
-        new_attachment_id = cur.lastrowid
-        log_activity(user_id, 'INSERT', 'attachment', new_attachment_id, f"Added attachment '{original_filename}' to maintenance record {maintenance_id}")
-        return new_attachment_id
-
-def get_attachments_for_record(maintenance_id):
-    with get_cursor() as cur:
-        sql = "SELECT id, original_filename, stored_filepath FROM attachments WHERE maintenance_id = %s ORDER BY id"
-        cur.execute(sql, (maintenance_id,))
-        return cur.fetchall()
-
-def delete_attachment(attachment_id, user_id):
-    try:
-        with get_cursor() as cur:
-            cur.execute("SELECT stored_filepath, original_filename, maintenance_id FROM attachments WHERE id = %s", (attachment_id,))
-            attachment = cur.fetchone()
-            if not attachment: return False, "Attachment not found."
-            if os.path.exists(attachment['stored_filepath']):
-                os.remove(attachment['stored_filepath'])
-            cur.execute("DELETE FROM attachments WHERE id = %s", (attachment_id,))
-            if cur.rowcount > 0:
-                log_activity(user_id, 'DELETE', 'attachment', attachment_id, f"Removed attachment '{attachment['original_filename']}' from maintenance record {attachment['maintenance_id']}")
-                return True, "Attachment deleted successfully."
-            else:
-                return False, "Failed to delete attachment record from database."
-    except Exception as e:
-        return False, f"An error occurred: {str(e)}"
-
-# --- RECORD HISTORY ---
-def get_history_for_record(record_id):
-    sql = "SELECT u.username, al.action, al.description, al.timestamp FROM activity_log al LEFT JOIN users u ON al.user_id = u.id WHERE al.record_type = 'maintenance' AND al.record_id = %s ORDER BY al.timestamp DESC"
-    with get_cursor() as cur:
-        cur.execute(sql, (record_id,))
-        return cur.fetchall()
-
-# --- ADVANCED SEARCH ---
-def search_records_advanced(filters):
-    base_sql = "SELECT * FROM maintenance WHERE is_deleted = 0"
-    params = []
-    
-    if filters.get('date_from') and filters.get('date_to'):
-        base_sql += " AND date BETWEEN %s AND %s"
-        params.extend([filters['date_from'], filters['date_to']])
-
-    if filters.get('department'):
-        base_sql += " AND department = %s"
-        params.append(filters['department'])
-
-    if filters.get('keyword'):
-        kw = f"%{filters['keyword']}%"
-        base_sql += " AND (device LIKE %s OR procedures LIKE %s OR materials LIKE %s OR notes LIKE %s OR warnings LIKE %s)"
-        params.extend([kw] * 5)
-
-    base_sql += " ORDER BY id DESC"
-    
-    with get_cursor() as cur:
-        cur.execute(base_sql, params)
-        return cur.fetchall()
-
-# --- REPORTS/DASHBOARD ---
-def get_records_count_in_period(date_from, date_to, department=None):
-    sql = "SELECT COUNT(*) AS count FROM maintenance WHERE is_deleted = 0 AND date BETWEEN %s AND %s"
-    params = [date_from, date_to]
-    if department:
-        sql += " AND department = %s "
-        params.append(department)
-    with get_cursor() as cur:
-        cur.execute(sql, params)
-        result = cur.fetchone()
-        return result['count'] if result else 0
-
-def get_avg_records_per_day(date_from, date_to, department=None):
-    try:
-        dt_from = datetime.strptime(date_from, "%Y-%m-%d")
-        dt_to = datetime.strptime(date_to, "%Y-%m-%d")
-        delta_days = (dt_to - dt_from).days + 1
-        if delta_days <= 0: return 0
-    except ValueError:
-        return 0
-    total_count = get_records_count_in_period(date_from, date_to, department)
-    return total_count / delta_days if total_count > 0 else 0
-
-def get_records_per_department(date_from, date_to):
-    sql = "SELECT department, COUNT(*) AS count FROM maintenance WHERE is_deleted = 0 AND date BETWEEN %s AND %s GROUP BY department ORDER BY count DESC"
-    with get_cursor() as cur:
-        cur.execute(sql, (date_from, date_to))
-        return cur.fetchall()
-
-def get_device_type_counts(date_from, date_to, department=None):
-    sql = "SELECT type AS device_type, COUNT(*) AS count FROM maintenance WHERE is_deleted = 0 AND date BETWEEN %s AND %s"
-    params = [date_from, date_to]
-    if department:
-        sql += " AND department = %s "
-        params.append(department)
-    sql += " GROUP BY type ORDER BY count DESC"
-    with get_cursor() as cur:
-        cur.execute(sql, params)
-        return cur.fetchall()
-
-def get_technician_counts(date_from, date_to, department=None):
-    sql = "SELECT technician, COUNT(*) AS count FROM maintenance WHERE is_deleted = 0 AND date BETWEEN %s AND %s"
-    params = [date_from, date_to]
-    if department:
-        sql += " AND department = %s "
-        params.append(department)
-    sql += " GROUP BY technician ORDER BY count DESC"
-    with get_cursor() as cur:
-        cur.execute(sql, params)
+﻿# db_ops.py
+import mysql.connector
+from contextlib import contextmanager
+import subprocess
+import os
+from datetime import datetime
+import configparser
+import re
+import atexit
+import sys # <-- ADDED IMPORT
+import threading
+from itertools import islice, chain
+from collections import Counter, OrderedDict
+from functools import wraps
+import time
+import json
+import search_index
+import activity_archive
+import attachment_store
+import db_pool
+from mysql.connector import errorcode
+
+def get_base_path():
+    """ Get the correct base path whether running as a script or a frozen exe."""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    else:
+        return os.path.dirname(os.path.abspath(__file__))
+
+config = configparser.ConfigParser()
+config_path = os.path.join(get_base_path(), 'config.ini')
+if not config.read(config_path):
+    print(f"Error: config.ini not found at {config_path}")
+
+DB_CONFIG = dict(
+    host=config.get('database', 'host'),
+    user=config.get('database', 'user'),
+    password=config.get('database', 'password'),
+    database=config.get('database', 'database'),
+    charset=config.get('database', 'charset'),
+    collation=config.get('database', 'collation')
+)
+
+# --- Connection Pool (sizes and timeouts from the optional [pool] section of config.ini) ---
+POOL_CONFIG = dict(
+    pool_size=config.getint('pool', 'pool_size', fallback=5),
+    min_idle=config.getint('pool', 'min_idle', fallback=1),
+    max_lifetime=config.getint('pool', 'max_lifetime', fallback=1800),
+    idle_timeout=config.getint('pool', 'idle_timeout', fallback=300),
+    acquire_timeout=config.getfloat('pool', 'acquire_timeout', fallback=10),
+    max_waiters=config.getint('pool', 'max_waiters', fallback=50),
+    statement_cache_size=config.getint('pool', 'statement_cache_size', fallback=64),
+)
+# No connection is opened here; the first query (or warm_up) opens one.
+pool = db_pool.ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+
+def warm_up():
+    """Open the pool's idle connections ahead of the first query. Meant for a background thread at startup."""
+    try:
+        pool.warm()
+    except mysql.connector.Error as err:
+        print(f"Error connecting to the database: {err}")
+
+def _rollback(conn, err):
+    if db_pool.is_transient(err):
+        conn.broken = True # the link is gone; let the pool replace it
+        return
+    try:
+        conn.rollback()
+    except mysql.connector.Error:
+        conn.broken = True
+
+@contextmanager
+def get_cursor(prepared=False):
+    """Dict cursor on a pooled connection, committed on success. prepared=True runs statements as server-side
+    prepared statements cached per connection; use it for the hot, fixed-shape queries."""
+    conn = pool.get_connection(validate=_retrying_read())
+    cur = db_pool.PreparedCursor(conn) if prepared else conn.cursor(dictionary=True)
+    try:
+        yield cur
+        conn.commit()
+    except Exception as err:
+        _rollback(conn, err)
+        raise
+    finally:
+        try:
+            cur.close()
+        except mysql.connector.Error:
+            conn.broken = True
+        conn.close()
+
+# --- READ RETRY ---
+# A read that loses its link mid-flight (server restart, idle connection dropped by a firewall) is safe to run
+# again. _rollback has already marked the dead connection broken, so the retry gets another, pinged first.
+CONNECTION_LOST_ERRORS = {errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_SERVER_LOST}
+_read_retry = threading.local()
+
+def _connection_lost(err):
+    return isinstance(err, mysql.connector.Error) and err.errno in CONNECTION_LOST_ERRORS
+
+def _retrying_read():
+    return getattr(_read_retry, 'active', False)
+
+def retry_read(func):
+    """Run a read-only function once more if its connection is lost mid-query. Never use it on a write:
+    the server may have applied the statement before the link dropped."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except mysql.connector.Error as err:
+            if not _connection_lost(err) or _retrying_read(): raise
+            print(f"Lost the database connection during {func.__name__} ({err}); retrying once.")
+        _read_retry.active = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_retry.active = False
+    return wrapper
+
+STREAM_BATCH_SIZE = 500
+
+class QueryHandle:
+    """Lets another thread cancel a query streamed by iter_query with KILL QUERY on its connection.
+    The connection id is read under the lock but the KILL runs outside it, so a slow server does not stall the
+    streaming thread. A connection that was attached when cancel() ran is discarded rather than pooled, so a
+    late KILL can never reach a query that reused it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection_id = None
+        self.cancelled = False
+
+    def _attach(self, connection_id):
+        with self._lock:
+            self._connection_id = connection_id
+            return not self.cancelled
+
+    def _detach(self):
+        """Returns True if a KILL may still be on its way to the connection."""
+        with self._lock:
+            self._connection_id = None
+            return self.cancelled
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            connection_id = self._connection_id
+        if connection_id is not None:
+            kill_query(connection_id)
+
+def kill_query(connection_id):
+    """Abort the statement running on another connection (the connection itself stays open).
+    Uses a connection of its own: when every pooled one is busy streaming, waiting for one would defeat the point."""
+    try:
+        cnx = mysql.connector.connect(**DB_CONFIG)
+        try:
+            cur = cnx.cursor()
+            cur.execute("KILL QUERY %s", (int(connection_id),))
+            cur.close()
+        finally:
+            cnx.close()
+    except mysql.connector.Error as err:
+        if err.errno != 1094: # ER_NO_SUCH_THREAD: it already finished
+            print(f"Error cancelling query on connection {connection_id}: {err}")
+
+def iter_query(sql, params=(), batch_size=STREAM_BATCH_SIZE, handle=None):
+    """Yield rows one at a time from an unbuffered cursor, fetching them from the server in batches.
+    The pooled connection is taken on the first next() and given back when the generator is exhausted or closed.
+    Pass a QueryHandle to be able to cancel the query from another thread.
+    If the link is lost before the first row arrives, the query is sent once more on another connection."""
+    for attempt in range(2):
+        conn = pool.get_connection(validate=attempt > 0)
+        if handle is not None and not handle._attach(conn.connection_id):
+            conn.close()
+            return
+        cur = conn.cursor(dictionary=True, buffered=False)
+        try:
+            cur.execute(sql, params)
+            rows = cur.fetchmany(batch_size)
+            break
+        except mysql.connector.Error as err:
+            if handle is not None and handle._detach():
+                conn.broken = True
+            _rollback(conn, err)
+            try:
+                cur.close()
+            except mysql.connector.Error:
+                conn.broken = True
+            conn.close()
+            if not _connection_lost(err) or attempt > 0: raise
+    try:
+        while rows:
+            yield from rows
+            rows = cur.fetchmany(batch_size)
+    finally:
+        if handle is not None and handle._detach():
+            conn.broken = True # a KILL may still be in flight; never hand this session to another query
+        try:
+            # A consumer that stops early leaves rows on the wire; drain them so the connection can go back to the pool.
+            conn.consume_results()
+            cur.close()
+            # End the read's transaction so the next borrower does not inherit its snapshot and metadata locks.
+            conn.rollback()
+        except mysql.connector.Error:
+            conn.broken = True
+        conn.close()
+
+# --- READ-THROUGH CACHE ---
+# Results are tagged with the tables they read. Write functions decorated with @invalidates drop every
+# cached result for the tables they touch; the TTL bounds staleness from writes made by other clients.
+_cache_lock = threading.Lock()
+_caches = []
+_caches_by_table = {}
+_table_generations = Counter()
+_cache_counters = Counter()
+
+def cached(tables, ttl=60, maxsize=128):
+    """LRU + TTL cache for a read function. Cached values are shared between callers and must not be mutated."""
+    def decorator(func):
+        entries = OrderedDict()
+        _caches.append(entries)
+        for table in tables:
+            _caches_by_table.setdefault(table, []).append(entries)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with _cache_lock:
+                entry = entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    entries.move_to_end(key)
+                    _cache_counters['hits'] += 1
+                    return entry[1]
+                _cache_counters['misses'] += 1
+                generations = [_table_generations[t] for t in tables]
+            value = func(*args, **kwargs)
+            with _cache_lock:
+                # Skip storing if a write invalidated these tables while the query was running.
+                if generations == [_table_generations[t] for t in tables]:
+                    entries[key] = (time.monotonic() + ttl, value)
+                    entries.move_to_end(key)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            return value
+        return wrapper
+    return decorator
+
+def invalidate_cache(*tables):
+    """Drop cached results that read any of tables (all cached results when called without arguments)."""
+    with _cache_lock:
+        for table in tables or list(_caches_by_table):
+            _table_generations[table] += 1
+            for entries in _caches_by_table.get(table, ()):
+                entries.clear()
+            _cache_counters['invalidations'] += 1
+
+def invalidates(*tables):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate_cache(*tables)
+        return wrapper
+    return decorator
+
+def cache_stats():
+    with _cache_lock:
+        lookups = _cache_counters['hits'] + _cache_counters['misses']
+        return {
+            'hits': _cache_counters['hits'],
+            'misses': _cache_counters['misses'],
+            'invalidations': _cache_counters['invalidations'],
+            'entries': sum(len(entries) for entries in _caches),
+            'hit_ratio': _cache_counters['hits'] / lookups if lookups else 0.0,
+        }
+
+# --- OVERVIEW COUNTERS ---
+class OverviewCounters:
+    """In-process copy of the admin overview counters. Loaded with one get_overview_stats() query, then kept
+    current by deltas from the db_ops write paths; reloaded after max_age seconds to pick up other clients' writes."""
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._values = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            if self._values is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return dict(self._values)
+        values = get_overview_stats()
+        with self._lock:
+            self._values = values
+            self._loaded_at = time.monotonic()
+            return dict(values)
+
+    def apply(self, role_name=None, **deltas):
+        """Add deltas to the counters, e.g. apply(total_records=1) or apply('admin', total_users=-1)."""
+        if role_name:
+            deltas[f"{role_name}_count"] = deltas.get('total_users', 0)
+        with self._lock:
+            if self._values is None:
+                return
+            for key, delta in deltas.items():
+                if key in self._values:
+                    self._values[key] += delta
+
+    def reset(self):
+        with self._lock:
+            self._values = None
+
+overview_counters = OverviewCounters()
+
+# --- LOCAL TEXT INDEX (alternative to the LIKE scans of search_records_advanced) ---
+MAINTENANCE_FIELDS = ("date", "type", "device", "technician", "procedures", "materials", "notes", "warnings", "department")
+text_index = search_index.SearchIndex(os.path.join(get_base_path(), 'search_index.json.gz'))
+atexit.register(text_index.save)
+
+# --- BACKUP & RESTORE ---
+def backup_database(output_path):
+    try:
+        cmd = ["mysqldump", f"--host={DB_CONFIG['host']}", f"--user={DB_CONFIG['user']}", f"--password={DB_CONFIG['password']}", "--single-transaction", "--routines", "--triggers", DB_CONFIG['database']]
+        with open(output_path, 'w', encoding='utf-8') as f:
+            result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, text=True)
+        if result.returncode == 0:
+            return True, f"تم إنشاء النسخة الاحتياطية بنجاح في:\n{output_path}"
+        else:
+            return False, f"فشل النسخ الاحتياطي:\n{result.stderr.strip()}"
+    except Exception as e:
+        return False, f"حدث استثناء أثناء النسخ الاحتياطي:\n{str(e)}"
+
+@invalidates()
+def restore_database(input_path):
+    overview_counters.reset()
+    try:
+        if not os.path.exists(input_path):
+            return False, f"ملف النسخة الاحتياطية غير موجود: {input_path}"
+        cmd = ["mysql", f"--host={DB_CONFIG['host']}", f"--user={DB_CONFIG['user']}", f"--password={DB_CONFIG['password']}", DB_CONFIG['database']]
+        with open(input_path, 'r', encoding='utf-8') as f:
+            result = subprocess.run(cmd, stdin=f, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode == 0:
+            # The restored rows replace everything the local caches and text index know about.
+            invalidate_cache()
+            text_index.reset()
+            return True, "تمت استعادة النسخة الاحتياطية بنجاح."
+        else:
+            return False, f"فشل استعادة النسخة الاحتياطية:\n{result.stderr.strip()}"
+    except Exception as e:
+        return False, f"حدث استثناء أثناء استعادة النسخة الاحتياطية:\n{str(e)}"
+
+# --- ACTIVITY LOG ---
+ACTIVITY_LOG_INSERT_SQL = "INSERT INTO activity_log (user_id, action, record_type, record_id, description) VALUES "
+ACTIVITY_LOG_ROW = "(%s, %s, %s, %s, %s)"
+
+def log_activity(user_id, action, record_type, record_id=None, description=None, cur=None):
+    """Write one log row. Pass the caller's cursor so the entry commits (or rolls back) with the change it describes;
+    without one the entry is queued on activity_log_buffer and written with the next batch."""
+    if cur is not None:
+        cur.execute(ACTIVITY_LOG_INSERT_SQL + ACTIVITY_LOG_ROW, (user_id, action, record_type, record_id, description or ""))
+        return
+    activity_log_buffer.add(user_id, action, record_type, record_id, description)
+
+class ActivityLogBuffer:
+    """Queues log entries and writes them with a single multi-row INSERT once max_entries are queued
+    or max_delay seconds after the first queued entry, whichever comes first.
+    A batch that keeps failing for a reason other than a lost connection is written row by row after
+    max_retries attempts, and the rows that still fail (e.g. their user was deleted meanwhile) are dropped
+    and printed. At most max_queued entries are kept while the database is unreachable."""
+
+    def __init__(self, max_entries=50, max_delay=2.0, max_retries=3, max_queued=10000):
+        self.max_entries = max_entries
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.max_queued = max_queued
+        self._entries = []
+        self._timer = None
+        self._failed_writes = 0 # consecutive failed batch writes
+        self._lock = threading.Lock()
+
+    def add(self, user_id, action, record_type, record_id=None, description=None):
+        with self._lock:
+            self._entries.append((user_id, action, record_type, record_id, description or ""))
+            if len(self._entries) >= self.max_entries:
+                entries = self._take()
+            else:
+                entries = None
+                self._arm()
+        if entries:
+            self._write(entries)
+
+    def flush(self):
+        with self._lock:
+            entries = self._take()
+        if entries:
+            self._write(entries)
+
+    def _arm(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.max_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _take(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        entries, self._entries = self._entries, []
+        return entries
+
+    def _write(self, entries):
+        sql = ACTIVITY_LOG_INSERT_SQL + ", ".join([ACTIVITY_LOG_ROW] * len(entries))
+        params = [value for entry in entries for value in entry]
+        try:
+            # One entry and a full batch have fixed shapes worth preparing; other timer flush sizes run as text.
+            with get_cursor(prepared=len(entries) in (1, self.max_entries)) as cur:
+                cur.execute(sql, params)
+        except Exception as e:
+            print(f"Error writing activity log batch: {e}")
+            with self._lock:
+                self._failed_writes += 1
+                if db_pool.is_transient(e) or self._failed_writes < self.max_retries:
+                    self._requeue(entries)
+                    return
+                self._failed_writes = 0
+            self._write_rows(entries) # one bad row must not hold back the others
+        else:
+            with self._lock:
+                self._failed_writes = 0
+        invalidate_cache('activity_log') # cached record bundles carry the history
+
+    def _write_rows(self, entries):
+        for position, entry in enumerate(entries):
+            try:
+                with get_cursor(prepared=True) as cur:
+                    cur.execute(ACTIVITY_LOG_INSERT_SQL + ACTIVITY_LOG_ROW, entry)
+            except Exception as e:
+                if db_pool.is_transient(e):
+                    with self._lock:
+                        self._requeue(entries[position:])
+                    return
+                print(f"Dropped activity log entry {entry}: {e}")
+
+    def _requeue(self, entries):
+        # Called with the lock held. Failed entries go back in front, for the next flush.
+        self._entries[:0] = entries
+        overflow = len(self._entries) - self.max_queued
+        if overflow > 0:
+            print(f"Activity log buffer is full; dropped the {overflow} oldest entries.")
+            del self._entries[:overflow]
+        self._arm()
+
+activity_log_buffer = ActivityLogBuffer()
+atexit.register(activity_log_buffer.flush)
+
+ACTIVITY_LOG_SQL = "SELECT al.id, u.username, al.action, al.record_type, al.record_id, al.description, al.timestamp FROM activity_log al LEFT JOIN users u ON al.user_id = u.id"
+ACTIVITY_LOG_PAGE_SIZE = 200
+ACTIVITY_ACTIONS = ('INSERT', 'UPDATE', 'TRASH', 'RESTORE', 'DELETE', 'IMPORT')
+ACTIVITY_RECORD_TYPES = ('maintenance', 'user', 'department', 'attachment')
+
+def _activity_log_query(filters=None, after=None, limit=None):
+    """Newest-first log query. filters may hold user_id, action, record_type, record_id, date_from and date_to
+    ('YYYY-MM-DD', both inclusive); after is the (timestamp, id) of the last row already shown."""
+    filters = filters or {}
+    conditions, params = [], []
+    for key in ('user_id', 'action', 'record_type', 'record_id'):
+        if filters.get(key) not in (None, ''):
+            conditions.append(f"al.{key} = %s")
+            params.append(filters[key])
+    if filters.get('date_from'):
+        conditions.append("al.timestamp >= %s")
+        params.append(filters['date_from'])
+    if filters.get('date_to'):
+        conditions.append("al.timestamp < %s + INTERVAL 1 DAY")
+        params.append(filters['date_to'])
+    if after is not None:
+        # Keyset on (timestamp, id), spelled out so MySQL can range-scan the index instead of comparing row values.
+        conditions.append("(al.timestamp < %s OR (al.timestamp = %s AND al.id < %s))")
+        params.extend([after[0], after[0], after[1]])
+    sql = ACTIVITY_LOG_SQL
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY al.timestamp DESC, al.id DESC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+def fetch_activity_log(limit=100):
+    return fetch_activity_log_page(limit=limit)
+
+@retry_read
+def fetch_activity_log_page(filters=None, after=None, limit=ACTIVITY_LOG_PAGE_SIZE):
+    """One keyset page of the log; pass the (timestamp, id) of the previous page's last row as after.
+    Once the table runs out the page continues into the archived segments, which only hold older entries."""
+    activity_log_buffer.flush()
+    sql, params = _activity_log_query(filters, after, limit)
+    with get_cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    if len(rows) < limit:
+        archive_after = (rows[-1]['timestamp'], rows[-1]['id']) if rows else after
+        rows.extend(islice(log_archive.iter_entries(filters, archive_after), limit - len(rows)))
+    return rows
+
+def iter_activity_log(limit=None, filters=None):
+    """Stream the table's entries, then the archived ones. Closing the generator gives the connection back."""
+    activity_log_buffer.flush()
+    hot = iter_query(*_activity_log_query(filters))
+    try:
+        yield from islice(chain(hot, log_archive.iter_entries(filters)), limit)
+    finally:
+        hot.close()
+
+# --- ACTIVITY LOG ARCHIVE (see activity_archive.py) ---
+ARCHIVE_MAX_AGE_DAYS = config.getint('archive', 'max_age_days', fallback=365)
+ARCHIVE_BATCH_SIZE = config.getint('archive', 'batch_size', fallback=activity_archive.ARCHIVE_BATCH_SIZE)
+ARCHIVE_DIRECTORY = config.get('archive', 'directory', fallback='').strip()
+log_archive = activity_archive.ActivityArchive(ARCHIVE_DIRECTORY or None)
+
+def archive_activity_log(max_age_days=ARCHIVE_MAX_AGE_DAYS, batch_size=ARCHIVE_BATCH_SIZE, log=None):
+    """Move log entries older than max_age_days out of the table into the archive segments.
+    Raises ValueError unless [archive] directory names a reachable shared folder."""
+    activity_archive.validate_archive_directory(ARCHIVE_DIRECTORY)
+    activity_log_buffer.flush()
+    return activity_archive.archive_activity_log(log_archive, get_cursor, max_age_days, batch_size, log)
+
+# --- SCHEMA READINESS ---
+# main.py applies pending migrations in the background while the login form is shown. Code that needs the
+# tables they create (the daily stats rollup and the reports) waits for that to finish or fail.
+SCHEMA_WAIT_TIMEOUT = 120
+_schema_ready = threading.Event()
+_schema_ready.set() # scripts that do not migrate at startup never wait
+
+def begin_schema_upgrade():
+    _schema_ready.clear()
+
+def end_schema_upgrade():
+    _schema_ready.set()
+
+def needs_schema(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _schema_ready.wait(SCHEMA_WAIT_TIMEOUT):
+            raise RuntimeError("The database upgrade is still running; please try again in a moment.")
+        return func(*args, **kwargs)
+    return wrapper
+
+# --- DAILY STATS ROLLUP (see migrations/m0002_daily_stats.py) ---
+DAILY_STATS_UPSERT_SQL = ("INSERT INTO maintenance_daily_stats (stat_date, department, type, technician, record_count) VALUES (%s, %s, %s, %s, %s) "
+                          "ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)")
+
+def _stats_key(date, type_, technician, department):
+    return (date, department or '', type_ or '', technician or '')
+
+def _record_stats_key(record):
+    return _stats_key(record['date'], record['type'], record['technician'], record['department'])
+
+def _data_stats_key(data):
+    # data is a record tuple in MAINTENANCE_FIELDS order
+    return _stats_key(data[0], data[1], data[3], data[8])
+
+def _adjust_daily_stats(cur, deltas):
+    """Apply {stats_key: count_delta} to the rollup inside the caller's transaction."""
+    rows = [(*key, delta) for key, delta in deltas.items() if delta]
+    if rows:
+        cur.executemany(DAILY_STATS_UPSERT_SQL, rows)
+
+@needs_schema
+def rebuild_daily_stats():
+    """Recompute maintenance_daily_stats from scratch. Returns the number of groups written."""
+    with get_cursor() as cur:
+        cur.execute("DELETE FROM maintenance_daily_stats")
+        cur.execute("INSERT INTO maintenance_daily_stats (stat_date, department, type, technician, record_count) "
+                    "SELECT date, COALESCE(department, ''), COALESCE(type, ''), COALESCE(technician, ''), COUNT(*) "
+                    "FROM maintenance WHERE is_deleted = 0 GROUP BY 1, 2, 3, 4")
+        return cur.rowcount
+
+# --- CRUD maintenance ---
+INSERT_RECORD_SQL = "INSERT INTO maintenance (date, type, device, technician, procedures, materials, notes, warnings, department) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+IMPORT_CHUNK_SIZE = 500
+
+@invalidates('maintenance')
+@needs_schema
+def insert_record(data, user_id):
+    with get_cursor() as cur:
+        cur.execute(INSERT_RECORD_SQL, data)
+        new_record_id = cur.lastrowid
+        _adjust_daily_stats(cur, {_data_stats_key(data): 1})
+        log_activity(user_id, 'INSERT', 'maintenance', new_record_id, f"Added record for device: {data[2]}", cur=cur)
+    overview_counters.apply(total_records=1)
+    text_index.add(new_record_id, dict(zip(MAINTENANCE_FIELDS, data)))
+    return new_record_id
+
+def _records_query(department=None):
+    sql = "SELECT * FROM maintenance WHERE is_deleted = 0"
+    params = []
+    if department:
+        sql += " AND department = %s"
+        params.append(department)
+    sql += " ORDER BY id DESC"
+    return sql, params
+
+@retry_read
+def fetch_records(department=None):
+    sql, params = _records_query(department)
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+def iter_records(department=None):
+    return iter_query(*_records_query(department))
+
+# List views only need the short columns plus a snippet of each long text column; get_record() loads the rest.
+SNIPPET_LENGTH = 50
+LIST_COLUMNS = ", ".join(
+    ["id", "date", "type", "device", "technician", "department"] +
+    [f"IF(CHAR_LENGTH({col}) > {SNIPPET_LENGTH}, CONCAT(LEFT({col}, {SNIPPET_LENGTH}), '...'), {col}) AS {col}"
+     for col in ("procedures", "materials", "notes", "warnings")]
+)
+
+@retry_read
+def get_record(rec_id):
+    with get_cursor(prepared=True) as cur:
+        cur.execute("SELECT * FROM maintenance WHERE id = %s", (rec_id,))
+        return cur.fetchone()
+
+@invalidates('maintenance')
+@needs_schema
+def insert_records_many(rows, user_id, chunk_size=IMPORT_CHUNK_SIZE):
+    """Insert an iterable of record tuples (MAINTENANCE_FIELDS order) with executemany.
+    Each chunk is committed on its own with one summary log entry. Returns the number of rows inserted."""
+    rows = iter(rows)
+    total = 0
+    with text_index.bulk(): # the index file is written once, after the last chunk
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return total
+            with get_cursor() as cur:
+                # The connector rewrites this into one multi-row INSERT, whose auto-increment ids are consecutive.
+                cur.executemany(INSERT_RECORD_SQL, chunk)
+                first_id = cur.lastrowid
+                last_id = first_id + len(chunk) - 1
+                _adjust_daily_stats(cur, Counter(_data_stats_key(data) for data in chunk))
+                log_activity(user_id, 'IMPORT', 'maintenance', first_id, f"Imported {len(chunk)} records (IDs {first_id}-{last_id})", cur=cur)
+            overview_counters.apply(total_records=len(chunk))
+            for offset, data in enumerate(chunk):
+                text_index.add(first_id + offset, dict(zip(MAINTENANCE_FIELDS, data)))
+            total += len(chunk)
+
+@retry_read
+def fetch_records_page(after_id=None, limit=200, department=None, date_from=None):
+    """Keyset page of active records (list columns only), newest first. Pass the last id of the previous page as after_id."""
+    sql = f"SELECT {LIST_COLUMNS} FROM maintenance WHERE is_deleted = 0"
+    params = []
+    if after_id is not None:
+        sql += " AND id < %s"
+        params.append(after_id)
+    if department:
+        sql += " AND department = %s"
+        params.append(department)
+    if date_from:
+        sql += " AND date >= %s"
+        params.append(date_from)
+    sql += " ORDER BY id DESC LIMIT %s"
+    params.append(limit)
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+@invalidates('maintenance')
+@needs_schema
+def update_record(rec_id, data, user_id):
+    sql = "UPDATE maintenance SET date=%s, type=%s, device=%s, technician=%s, procedures=%s, materials=%s, notes=%s, warnings=%s, department=%s WHERE id=%s"
+    with get_cursor() as cur:
+        cur.execute("SELECT date, type, technician, department, is_deleted FROM maintenance WHERE id = %s FOR UPDATE", (rec_id,))
+        old = cur.fetchone()
+        cur.execute(sql, (*data, rec_id))
+        updated = cur.rowcount > 0
+        if updated:
+            if old and not old['is_deleted']:
+                deltas = Counter({_record_stats_key(old): -1})
+                deltas[_data_stats_key(data)] += 1
+                _adjust_daily_stats(cur, deltas)
+            log_activity(user_id, 'UPDATE', 'maintenance', rec_id, f"Updated record for device: {data[2]}", cur=cur)
+    if updated and not old['is_deleted']: # a record in the trash stays out of the search index
+        text_index.add(rec_id, dict(zip(MAINTENANCE_FIELDS, data)))
+
+@invalidates('maintenance')
+@needs_schema
+def delete_record(rec_id, user_id):
+    with get_cursor() as cur:
+        cur.execute("SELECT date, type, technician, department FROM maintenance WHERE id = %s FOR UPDATE", (rec_id,))
+        record = cur.fetchone()
+        sql = "UPDATE maintenance SET is_deleted = 1 WHERE id = %s AND is_deleted = 0"
+        cur.execute(sql, (rec_id,))
+        trashed = cur.rowcount > 0
+        if trashed:
+            _adjust_daily_stats(cur, {_record_stats_key(record): -1})
+            log_activity(user_id, 'TRASH', 'maintenance', rec_id, f"Moved record to trash ID: {rec_id}", cur=cur)
+    if trashed:
+        overview_counters.apply(total_records=-1)
+    text_index.remove(rec_id)
+
+# --- TRASH MANAGEMENT (Maintenance Records) ---
+DELETED_RECORDS_SQL = "SELECT * FROM maintenance WHERE is_deleted = 1 ORDER BY id DESC"
+
+@retry_read
+def fetch_deleted_records():
+    with get_cursor() as cur:
+        cur.execute(DELETED_RECORDS_SQL)
+        return cur.fetchall()
+
+def iter_deleted_records():
+    return iter_query(DELETED_RECORDS_SQL)
+
+@invalidates('maintenance')
+@needs_schema
+def restore_record(rec_id, user_id):
+    with get_cursor() as cur:
+        cur.execute("SELECT * FROM maintenance WHERE id = %s FOR UPDATE", (rec_id,))
+        record = cur.fetchone()
+        sql = "UPDATE maintenance SET is_deleted = 0 WHERE id = %s AND is_deleted = 1"
+        cur.execute(sql, (rec_id,))
+        restored = cur.rowcount > 0
+        if restored:
+            _adjust_daily_stats(cur, {_record_stats_key(record): 1})
+            log_activity(user_id, 'RESTORE', 'maintenance', rec_id, f"Restored record from trash ID: {rec_id}", cur=cur)
+    if restored:
+        overview_counters.apply(total_records=1)
+    if record:
+        text_index.add(rec_id, record)
+
+@invalidates('maintenance')
+def permanently_delete_record(rec_id, user_id):
+    with get_cursor() as cur:
+        cur.execute("DELETE FROM maintenance WHERE id=%s AND is_deleted = 1", (rec_id,))
+        if cur.rowcount > 0:
+            log_activity(user_id, 'DELETE', 'maintenance', rec_id, f"Permanently deleted record ID: {rec_id}", cur=cur)
+
+# --- AUTH & USER MANAGEMENT ---
+def _user_role_name(cur, user_id):
+    cur.execute("SELECT r.role_name FROM users u JOIN roles r ON u.role_id = r.id WHERE u.id = %s", (user_id,))
+    row = cur.fetchone()
+    return row['role_name'] if row else None
+
+@retry_read
+def verify_user(username, password):
+    with get_cursor() as cur:
+        cur.execute("SELECT id, role_id, department FROM users WHERE username=%s AND password_hash=%s AND is_deleted = 0", (username, password))
+        return cur.fetchone()
+
+@cached(tables=('roles',), ttl=3600)
+@retry_read
+def get_role_name_by_id(role_id):
+    with get_cursor() as cur:
+        cur.execute("SELECT role_name FROM roles WHERE id=%s", (role_id,))
+        row = cur.fetchone()
+        return row['role_name'] if row else None
+
+@invalidates('users')
+def add_user(username, password, role_name, department, current_user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("SELECT id FROM roles WHERE role_name = %s", (role_name,))
+            role = cur.fetchone()
+            if not role: return False, "دور المستخدم غير موجود"
+            role_id = role['id']
+            cur.execute("SELECT id FROM users WHERE username=%s", (username,))
+            if cur.fetchone(): return False, "اسم المستخدم موجود بالفعل"
+            cur.execute("INSERT INTO users (username, password_hash, role_id, department) VALUES (%s, %s, %s, %s)", (username, password, role_id, department))
+            new_user_id = cur.lastrowid
+            log_activity(current_user_id, 'INSERT', 'user', new_user_id, f"Added user: {username} with role: {role_name}", cur=cur)
+        overview_counters.apply(role_name, total_users=1)
+        return True, "تمت الإضافة بنجاح"
+    except Exception as e:
+        return False, str(e)
+
+@invalidates('users')
+def update_user(user_id, role_name, department, new_password, current_user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("SELECT id FROM roles WHERE role_name = %s", (role_name,))
+            role = cur.fetchone()
+            if not role: return False, "الدور المحدد غير صالح."
+            role_id = role['id']
+            cur.execute("SELECT r.role_name, u.is_deleted FROM users u JOIN roles r ON u.role_id = r.id WHERE u.id = %s", (user_id,))
+            old = cur.fetchone()
+            if new_password:
+                sql = "UPDATE users SET role_id=%s, department=%s, password_hash=%s WHERE id=%s"
+                params = (role_id, department, new_password, user_id)
+                log_description = f"Updated user ID {user_id} (department, role, password)"
+            else:
+                sql = "UPDATE users SET role_id=%s, department=%s WHERE id=%s"
+                params = (role_id, department, user_id)
+                log_description = f"Updated user ID {user_id} (department, role)"
+            cur.execute(sql, params)
+            log_activity(current_user_id, 'UPDATE', 'user', user_id, log_description, cur=cur)
+        if old and not old['is_deleted'] and old['role_name'] != role_name:
+            overview_counters.apply(**{f"{old['role_name']}_count": -1, f"{role_name}_count": 1})
+        return True, "تم تحديث المستخدم بنجاح."
+    except Exception as e:
+        return False, f"فشل تحديث المستخدم: {str(e)}"
+
+@invalidates('users')
+def delete_user(user_id_to_delete, current_user_id):
+    if user_id_to_delete == current_user_id:
+        return False, "لا يمكنك حذف حسابك الخاص."
+    try:
+        with get_cursor() as cur:
+            role_name = _user_role_name(cur, user_id_to_delete)
+            cur.execute("UPDATE users SET is_deleted = 1 WHERE id = %s AND is_deleted = 0", (user_id_to_delete,))
+            trashed = cur.rowcount > 0
+            if trashed:
+                log_activity(current_user_id, 'TRASH', 'user', user_id_to_delete, f"Moved user to trash ID: {user_id_to_delete}", cur=cur)
+        if not trashed:
+            return False, "لم يتم العثور على المستخدم."
+        overview_counters.apply(role_name, total_users=-1)
+        return True, "تم نقل المستخدم إلى سلة المحذوفات."
+    except Exception as e:
+        return False, f"فشل حذف المستخدم: {str(e)}"
+
+# --- TRASH MANAGEMENT (Users) ---
+@retry_read
+def fetch_deleted_users():
+    sql = "SELECT u.id, u.username, r.role_name, u.department FROM users u JOIN roles r ON u.role_id = r.id WHERE u.is_deleted = 1 ORDER BY u.id"
+    with get_cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchall()
+
+@invalidates('users')
+def restore_user(user_id, admin_id):
+    with get_cursor() as cur:
+        role_name = _user_role_name(cur, user_id)
+        cur.execute("UPDATE users SET is_deleted = 0 WHERE id = %s AND is_deleted = 1", (user_id,))
+        restored = cur.rowcount > 0
+        if restored:
+            log_activity(admin_id, 'RESTORE', 'user', user_id, f"Restored user from trash ID: {user_id}", cur=cur)
+    if restored:
+        overview_counters.apply(role_name, total_users=1)
+
+@invalidates('users')
+def permanently_delete_user(user_id, admin_id):
+    with get_cursor() as cur:
+        cur.execute("DELETE FROM users WHERE id = %s AND is_deleted = 1", (user_id,))
+        if cur.rowcount > 0:
+            log_activity(admin_id, 'DELETE', 'user', user_id, f"Permanently deleted user ID: {user_id}", cur=cur)
+
+# --- ADMIN DASHBOARD HELPERS ---
+ACTIVE_USERS_SQL = "SELECT u.id, u.username, r.role_name, u.department FROM users u JOIN roles r ON u.role_id = r.id WHERE u.is_deleted = 0"
+
+@cached(tables=('users', 'roles'), ttl=60, maxsize=1)
+@retry_read
+def fetch_all_users():
+    with get_cursor() as cur:
+        cur.execute(ACTIVE_USERS_SQL + " ORDER BY u.id")
+        return cur.fetchall()
+
+@retry_read
+def fetch_user(user_id):
+    """Single active user in the fetch_all_users row format, or None if deleted or missing."""
+    with get_cursor() as cur:
+        cur.execute(ACTIVE_USERS_SQL + " AND u.id = %s", (user_id,))
+        return cur.fetchone()
+
+@retry_read
+def fetch_users_after(last_id):
+    with get_cursor() as cur:
+        cur.execute(ACTIVE_USERS_SQL + " AND u.id > %s ORDER BY u.id", (last_id,))
+        return cur.fetchall()
+
+@retry_read
+def get_overview_stats():
+    """Every admin overview counter in one round trip."""
+    sql = ("SELECT (SELECT COUNT(*) FROM maintenance WHERE is_deleted = 0) AS total_records, "
+           "COUNT(*) AS total_users, "
+           "CAST(COALESCE(SUM(r.role_name = 'admin'), 0) AS SIGNED) AS admin_count, "
+           "CAST(COALESCE(SUM(r.role_name = 'user'), 0) AS SIGNED) AS user_count "
+           "FROM users u LEFT JOIN roles r ON u.role_id = r.id WHERE u.is_deleted = 0")
+    with get_cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchone()
+
+@cached(tables=('maintenance',), ttl=30, maxsize=1)
+@retry_read
+def get_total_record_count():
+    with get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS count FROM maintenance WHERE is_deleted = 0")
+        result = cur.fetchone()
+        return result['count'] if result else 0
+
+@cached(tables=('users',), ttl=60, maxsize=1)
+@retry_read
+def get_total_user_count():
+    with get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS count FROM users WHERE is_deleted = 0")
+        result = cur.fetchone()
+        return result['count'] if result else 0
+
+@cached(tables=('users', 'roles'), ttl=60, maxsize=16)
+@retry_read
+def get_user_role_count(role_name):
+    with get_cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS count FROM users u JOIN roles r ON u.role_id = r.id WHERE r.role_name = %s AND u.is_deleted = 0", (role_name,))
+        result = cur.fetchone()
+        return result['count'] if result else 0
+
+# --- DEPARTMENT MANAGEMENT ---
+@cached(tables=('departments',), ttl=300, maxsize=1)
+@retry_read
+def get_all_departments():
+    with get_cursor() as cur:
+        cur.execute("SELECT name FROM departments ORDER BY name")
+        return [row['name'] for row in cur.fetchall()]
+
+@invalidates('departments')
+def add_department(name, user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("INSERT INTO departments (name) VALUES (%s)", (name,))
+            new_dept_id = cur.lastrowid
+            log_activity(user_id, 'INSERT', 'department', new_dept_id, f"Added department: {name}", cur=cur)
+            return True, "تمت إضافة القسم بنجاح."
+    except mysql.connector.Error as err:
+        if err.errno == 1062: return False, "هذا القسم موجود بالفعل."
+        return False, str(err)
+
+@invalidates('departments')
+def update_department(department_id, new_name, user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("UPDATE departments SET name = %s WHERE id = %s", (new_name, department_id))
+            log_activity(user_id, 'UPDATE', 'department', department_id, f"Renamed department to: {new_name}", cur=cur)
+            return True, "تم تحديث القسم بنجاح."
+    except mysql.connector.Error as err:
+        if err.errno == 1062: return False, "اسم القسم هذا مستخدم بالفعل."
+        return False, str(err)
+
+@invalidates('departments')
+def delete_department(department_id, user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("SELECT name FROM departments WHERE id = %s", (department_id,))
+            dept_name = cur.fetchone()['name']
+            cur.execute("SELECT COUNT(*) as count FROM users WHERE department = %s AND is_deleted = 0", (dept_name,))
+            if cur.fetchone()['count'] > 0: return False, "لا يمكن حذف القسم لأنه معين لمستخدمين حاليين."
+            cur.execute("SELECT COUNT(*) as count FROM maintenance WHERE department = %s AND is_deleted = 0", (dept_name,))
+            if cur.fetchone()['count'] > 0: return False, "لا يمكن حذف القسم لأنه مستخدم في سجلات الصيانة."
+            cur.execute("DELETE FROM departments WHERE id = %s", (department_id,))
+            log_activity(user_id, 'DELETE', 'department', department_id, f"Deleted department: {dept_name}", cur=cur)
+            return True, "تم حذف القسم بنجاح."
+    except Exception as e:
+        return False, str(e)
+
+@cached(tables=('departments',), ttl=300)
+@retry_read
+def get_department_id_by_name(name):
+    with get_cursor() as cur:
+        cur.execute("SELECT id FROM departments WHERE name = %s", (name,))
+        result = cur.fetchone()
+        return result['id'] if result else None
+
+# --- ATTACHMENT MANAGEMENT ---
+def _insert_attachment(cur, maintenance_id, original_filename, stored_filepath, content_hash, user_id):
+    sql = "INSERT INTO attachments (maintenance_id, original_filename, stored_filepath, content_hash) VALUES (%s, %s, %s, %s)"
+    cur.execute(sql, (maintenance_id, original_filename, stored_filepath, content_hash))
+    new_attachment_id = cur.lastrowid
+    log_activity(user_id, 'INSERT', 'attachment', new_attachment_id, f"Added attachment '{original_filename}' to maintenance record {maintenance_id}", cur=cur)
+    return new_attachment_id
+
+def _insert_stored_attachment(cur, maintenance_id, source_path, original_filename, content_hash, stored_filepath, user_id):
+    """Insert the row, then make sure the stored file is still there. A delete_attachment or release_attachment_files
+    that counted no references before this INSERT may have removed it meanwhile: InnoDB gap locks do not exclude
+    each other, so the FOR UPDATE counts cannot prevent that. Once the row exists, later counts wait for it and
+    see it, so checking once after the INSERT is enough."""
+    attachment_id = _insert_attachment(cur, maintenance_id, original_filename, stored_filepath, content_hash, user_id)
+    if not os.path.exists(stored_filepath):
+        stored_again = attachment_store.put(source_path, content_hash, os.path.splitext(original_filename)[1])
+        if stored_again != stored_filepath:
+            cur.execute("UPDATE attachments SET stored_filepath = %s WHERE id = %s", (stored_again, attachment_id))
+    return attachment_id
+
+@invalidates('attachments')
+def add_attachment(maintenance_id, original_filename, stored_filepath, user_id):
+    with get_cursor() as cur:
+        return _insert_attachment(cur, maintenance_id, original_filename, stored_filepath, None, user_id)
+
+@invalidates('attachments')
+def add_attachment_file(maintenance_id, source_path, user_id):
+    """Put a file into the content-addressed store (see attachment_store.py) and attach it to a record.
+    Content that is already stored only gets a new attachments row. Returns the new attachment id."""
+    original_filename = os.path.basename(source_path)
+    content_hash = attachment_store.hash_file(source_path) # before the transaction: it reads the whole file
+    with get_cursor() as cur:
+        cur.execute("SELECT stored_filepath FROM attachments WHERE content_hash = %s LIMIT 1", (content_hash,))
+        existing = cur.fetchone()
+        if existing and os.path.exists(existing['stored_filepath']):
+            stored_filepath = existing['stored_filepath']
+        else:
+            stored_filepath = attachment_store.put(source_path, content_hash, os.path.splitext(original_filename)[1])
+        return _insert_stored_attachment(cur, maintenance_id, source_path, original_filename, content_hash, stored_filepath, user_id)
+
+@invalidates('attachments')
+def add_attachments_many(files, user_id):
+    """Attach files already copied into the store by attachment_store.ingest, all in one transaction.
+    files are (maintenance_id, source_path, original_filename, content_hash, stored_filepath) tuples; returns the new ids."""
+    new_ids = []
+    with get_cursor() as cur:
+        for maintenance_id, source_path, original_filename, content_hash, stored_filepath in files:
+            # A delete_attachment that ran since the copy may have taken the file; the insert puts it back.
+            new_ids.append(_insert_stored_attachment(cur, maintenance_id, source_path, original_filename, content_hash, stored_filepath, user_id))
+    return new_ids
+
+def _remove_if_unreferenced(cur, content_hash, stored_filepath):
+    # A deduplicated file is shared: it goes only with its last reference.
+    refs = 0
+    if content_hash:
+        cur.execute("SELECT COUNT(*) AS refs FROM attachments WHERE content_hash = %s AND stored_filepath = %s FOR UPDATE",
+                    (content_hash, stored_filepath))
+        refs = cur.fetchone()['refs']
+    if not refs:
+        attachment_store.remove(stored_filepath)
+
+def release_attachment_files(files):
+    """Remove stored files no attachments row refers to, e.g. the copies of a cancelled ingest. files are (content_hash, stored_filepath) pairs."""
+    with get_cursor() as cur:
+        for content_hash, stored_filepath in files:
+            _remove_if_unreferenced(cur, content_hash, stored_filepath)
+
+@retry_read
+def get_attachments_for_record(maintenance_id):
+    with get_cursor(prepared=True) as cur:
+        sql = "SELECT id, original_filename, stored_filepath, content_hash FROM attachments WHERE maintenance_id = %s ORDER BY id"
+        cur.execute(sql, (maintenance_id,))
+        return cur.fetchall()
+
+@invalidates('attachments')
+def delete_attachment(attachment_id, user_id):
+    try:
+        with get_cursor() as cur:
+            cur.execute("SELECT stored_filepath, original_filename, maintenance_id, content_hash FROM attachments WHERE id = %s FOR UPDATE", (attachment_id,))
+            attachment = cur.fetchone()
+            if not attachment: return False, "Attachment not found."
+            cur.execute("DELETE FROM attachments WHERE id = %s", (attachment_id,))
+            if cur.rowcount > 0:
+                _remove_if_unreferenced(cur, attachment['content_hash'], attachment['stored_filepath'])
+                log_activity(user_id, 'DELETE', 'attachment', attachment_id, f"Removed attachment '{attachment['original_filename']}' from maintenance record {attachment['maintenance_id']}", cur=cur)
+                return True, "Attachment deleted successfully."
+            else:
+                return False, "Failed to delete attachment record from database."
+    except Exception as e:
+        return False, f"An error occurred: {str(e)}"
+
+# --- RECORD HISTORY ---
+@retry_read
+def get_history_for_record(record_id):
+    sql = "SELECT u.username, al.action, al.description, al.timestamp FROM activity_log al LEFT JOIN users u ON al.user_id = u.id WHERE al.record_type = 'maintenance' AND al.record_id = %s ORDER BY al.timestamp DESC"
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, (record_id,))
+        history = cur.fetchall()
+    return history + _archived_history(record_id)
+
+def _archived_history(record_id):
+    # Older entries may have been archived; the archive index says which segments mention this record.
+    return [{key: entry[key] for key in ('username', 'action', 'description', 'timestamp')}
+            for entry in log_archive.history_for_record(record_id)]
+
+# --- RECORD DETAIL BUNDLE ---
+# The record, its attachments and its history in one round trip, as the two JSON arrays of a single row.
+RECORD_BUNDLE_SQL = (
+    "SELECT m.*, "
+    "(SELECT JSON_ARRAYAGG(JSON_OBJECT('id', a.id, 'original_filename', a.original_filename, 'stored_filepath', a.stored_filepath, 'content_hash', a.content_hash)) "
+    "FROM attachments a WHERE a.maintenance_id = m.id) AS attachments_json, "
+    "(SELECT JSON_ARRAYAGG(JSON_OBJECT('id', al.id, 'username', u.username, 'action', al.action, 'description', al.description, 'timestamp', al.timestamp)) "
+    "FROM activity_log al LEFT JOIN users u ON al.user_id = u.id WHERE al.record_type = 'maintenance' AND al.record_id = m.id) AS history_json "
+    "FROM maintenance m WHERE m.id = %s"
+)
+
+@cached(('maintenance', 'attachments', 'activity_log'), ttl=60, maxsize=32)
+@retry_read
+def get_record_bundle(rec_id):
+    """{'record', 'attachments', 'history'} for the detail pane, or None if the record does not exist."""
+    try:
+        with get_cursor(prepared=True) as cur:
+            cur.execute(RECORD_BUNDLE_SQL, (rec_id,))
+            record = cur.fetchone()
+    except mysql.connector.Error as err:
+        if err.errno not in (1064, 1305): raise # no JSON_ARRAYAGG (MySQL < 5.7.22, MariaDB < 10.5)
+        return _get_record_bundle_separately(rec_id)
+    if not record:
+        return None
+    # JSON_ARRAYAGG does not keep an order, so both lists are sorted here.
+    attachments = sorted(json.loads(record.pop('attachments_json') or '[]'), key=lambda att: att['id'])
+    history = json.loads(record.pop('history_json') or '[]')
+    for entry in history:
+        entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+    history.sort(key=lambda entry: (entry['timestamp'], entry['id']), reverse=True)
+    return {'record': record, 'attachments': attachments, 'history': history + _archived_history(rec_id)}
+
+def _get_record_bundle_separately(rec_id):
+    record = get_record(rec_id)
+    if not record:
+        return None
+    return {'record': record, 'attachments': get_attachments_for_record(rec_id), 'history': get_history_for_record(rec_id)}
+
+# --- ADVANCED SEARCH ---
+def _search_records_query(filters, columns="*"):
+    base_sql = f"SELECT {columns} FROM maintenance WHERE is_deleted = 0"
+    params = []
+    
+    if filters.get('date_from') and filters.get('date_to'):
+        base_sql += " AND date BETWEEN %s AND %s"
+        params.extend([filters['date_from'], filters['date_to']])
+
+    if filters.get('department'):
+        base_sql += " AND department = %s"
+        params.append(filters['department'])
+
+    if filters.get('keyword'):
+        kw = f"%{filters['keyword']}%"
+        base_sql += " AND (device LIKE %s OR procedures LIKE %s OR materials LIKE %s OR notes LIKE %s OR warnings LIKE %s)"
+        params.extend([kw] * 5)
+
+    base_sql += " ORDER BY id DESC"
+    return base_sql, params
+
+@retry_read
+def search_records_advanced(filters):
+    sql, params = _search_records_query(filters)
+    with get_cursor() as cur:
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+def iter_search_records_advanced(filters):
+    return iter_query(*_search_records_query(filters))
+
+# --- FULL-TEXT SEARCH (see migrations/m0001_fulltext_search.py) ---
+SEARCH_RESULT_LIMIT = 500
+NGRAM_TOKEN_SIZE = 2 # must match the server's ngram_token_size; shorter terms are never indexed
+FULLTEXT_COLUMNS = "device, procedures, materials, notes, warnings"
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+def _boolean_search_expression(keyword):
+    """Turn free text into a boolean-mode expression where every word is a required ngram phrase."""
+    terms = [t for t in _BOOLEAN_OPERATORS.sub(" ", keyword or "").split() if len(t) >= NGRAM_TOKEN_SIZE]
+    return " ".join(f'+"{term}"' for term in terms)
+
+def _search_like_query(keyword, department, limit, offset=0):
+    sql, params = _search_records_query({'keyword': keyword, 'department': department}, columns=LIST_COLUMNS)
+    return sql + " LIMIT %s OFFSET %s", [*params, limit, offset]
+
+def _search_all_fields_query(keyword, department, limit, offset=0):
+    expression = _boolean_search_expression(keyword)
+    if not expression:
+        if keyword and keyword.strip():
+            # Only single-letter terms: they are below the ngram size, so fall back to a plain scan.
+            return _search_like_query(keyword.strip(), department, limit, offset)
+        sql = f"SELECT {LIST_COLUMNS} FROM maintenance WHERE is_deleted = 0"
+        params = []
+    else:
+        match = f"MATCH({FULLTEXT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)"
+        sql = f"SELECT {LIST_COLUMNS}, {match} AS relevance FROM maintenance WHERE is_deleted = 0 AND {match}"
+        params = [expression, expression]
+    if department:
+        sql += " AND department = %s"
+        params.append(department)
+    sql += " ORDER BY relevance DESC, id DESC" if expression else " ORDER BY id DESC"
+    sql += " LIMIT %s OFFSET %s"
+    params.extend([limit, offset])
+    return sql, params
+
+def iter_search_all_fields(keyword, department=None, limit=SEARCH_RESULT_LIMIT, offset=0, handle=None):
+    """Stream the rows of search_all_fields as the server sends them; offset pages through the ranked results."""
+    try:
+        yield from iter_query(*_search_all_fields_query(keyword, department, limit, offset), handle=handle)
+    except mysql.connector.Error as err:
+        if err.errno != 1191: raise # ER_FT_MATCHING_KEY_NOT_FOUND: the migration has not been run yet
+        yield from iter_query(*_search_like_query(keyword.strip(), department, limit, offset), handle=handle)
+
+def search_all_fields(keyword, department=None, limit=SEARCH_RESULT_LIMIT, offset=0):
+    """Ranked search returning list columns only (see LIST_COLUMNS); use get_record() for the full text."""
+    return list(iter_search_all_fields(keyword, department, limit, offset))
+
+def sync_search_index():
+    """Bring the local text index up to date. Changes made by other clients are found through activity_log."""
+    with get_cursor() as cur:
+        cur.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM activity_log")
+        last_log_id = cur.fetchone()['last_id']
+    if not text_index.is_built:
+        text_index.rebuild(iter_records(), last_log_id)
+        return
+    if last_log_id <= text_index.last_log_id:
+        return
+    with get_cursor() as cur:
+        # New rows are found by id (bulk imports log one entry per chunk); edits, trash and restores through the log.
+        # last_record_id only moves here, so rows another client imported below a local insert are still found.
+        cur.execute("SELECT * FROM maintenance WHERE is_deleted = 0 AND id > %s", (text_index.last_record_id,))
+        last_record_id = text_index.last_record_id
+        for record in cur.fetchall():
+            text_index.add(record['id'], record)
+            last_record_id = max(last_record_id, record['id'])
+        cur.execute("SELECT DISTINCT record_id FROM activity_log WHERE id > %s AND id <= %s AND record_type = 'maintenance' AND action <> 'IMPORT' AND record_id IS NOT NULL", (text_index.last_log_id, last_log_id))
+        changed_ids = [row['record_id'] for row in cur.fetchall()]
+        live_records = {}
+        if changed_ids:
+            placeholders = ", ".join(["%s"] * len(changed_ids))
+            cur.execute(f"SELECT * FROM maintenance WHERE is_deleted = 0 AND id IN ({placeholders})", changed_ids)
+            live_records = {row['id']: row for row in cur.fetchall()}
+    for record_id in changed_ids:
+        if record_id in live_records:
+            text_index.add(record_id, live_records[record_id])
+        else:
+            text_index.remove(record_id)
+    text_index.mark_synced(last_log_id, last_record_id)
+
+def search_records_indexed(query, department=None, limit=SEARCH_RESULT_LIMIT):
+    """Search through the local text index; the matching ids are then fetched with WHERE id IN (...)."""
+    sync_search_index()
+    ids = text_index.search(query)
+    results = []
+    # Ids are newest first; fetch in limit-sized slices so a department filter still fills the page.
+    for start in range(0, len(ids), limit):
+        chunk = ids[start:start + limit]
+        sql = f"SELECT {LIST_COLUMNS} FROM maintenance WHERE is_deleted = 0 AND id IN ({', '.join(['%s'] * len(chunk))})"
+        params = list(chunk)
+        if department:
+            sql += " AND department = %s"
+            params.append(department)
+        sql += " ORDER BY id DESC"
+        with get_cursor() as cur:
+            cur.execute(sql, params)
+            results.extend(cur.fetchall())
+        if len(results) >= limit:
+            break
+    return results[:limit]
+
+# --- REPORTS/DASHBOARD ---
+# Report figures are read from maintenance_daily_stats; '' keys are turned back into NULL for the UI.
+@needs_schema
+@retry_read
+def get_records_count_in_period(date_from, date_to, department=None):
+    sql = "SELECT CAST(COALESCE(SUM(record_count), 0) AS SIGNED) AS count FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s"
+    params = [date_from, date_to]
+    if department:
+        sql += " AND department = %s "
+        params.append(department)
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, params)
+        result = cur.fetchone()
+        return result['count'] if result else 0
+
+def _days_in_period(date_from, date_to):
+    try:
+        dt_from = datetime.strptime(date_from, "%Y-%m-%d")
+        dt_to = datetime.strptime(date_to, "%Y-%m-%d")
+    except ValueError:
+        return 0
+    return max((dt_to - dt_from).days + 1, 0)
+
+def get_avg_records_per_day(date_from, date_to, department=None):
+    delta_days = _days_in_period(date_from, date_to)
+    if delta_days <= 0: return 0
+    total_count = get_records_count_in_period(date_from, date_to, department)
+    return total_count / delta_days if total_count > 0 else 0
+
+@needs_schema
+@retry_read
+def get_report_aggregates(date_from, date_to, department=None):
+    """All report figures from a single grouped query over the date range, split client-side.
+    per_department always covers every department (like get_records_per_department); the rest honour department."""
+    sql = ("SELECT NULLIF(department, '') AS department, NULLIF(type, '') AS type, NULLIF(technician, '') AS technician, CAST(SUM(record_count) AS SIGNED) AS count "
+           "FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s GROUP BY department, type, technician HAVING count > 0")
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, (date_from, date_to))
+        groups = cur.fetchall()
+    per_department, device_types, technicians = Counter(), Counter(), Counter()
+    total = 0
+    for group in groups:
+        per_department[group['department']] += group['count']
+        if department and group['department'] != department:
+            continue
+        device_types[group['type']] += group['count']
+        technicians[group['technician']] += group['count']
+        total += group['count']
+    delta_days = _days_in_period(date_from, date_to)
+    return {
+        'total': total,
+        'avg_per_day': total / delta_days if delta_days > 0 else 0,
+        'per_department': [{'department': k, 'count': v} for k, v in per_department.most_common()],
+        'device_types': [{'device_type': k, 'count': v} for k, v in device_types.most_common()],
+        'technicians': [{'technician': k, 'count': v} for k, v in technicians.most_common()],
+    }
+
+@needs_schema
+@retry_read
+def get_records_per_department(date_from, date_to):
+    sql = "SELECT NULLIF(department, '') AS department, CAST(SUM(record_count) AS SIGNED) AS count FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s GROUP BY department HAVING count > 0 ORDER BY count DESC"
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, (date_from, date_to))
+        return cur.fetchall()
+
+@needs_schema
+@retry_read
+def get_device_type_counts(date_from, date_to, department=None):
+    sql = "SELECT NULLIF(type, '') AS device_type, CAST(SUM(record_count) AS SIGNED) AS count FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s"
+    params = [date_from, date_to]
+    if department:
+        sql += " AND department = %s "
+        params.append(department)
+    sql += " GROUP BY type HAVING count > 0 ORDER BY count DESC"
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+@needs_schema
+@retry_read
+def get_technician_counts(date_from, date_to, department=None):
+    sql = "SELECT NULLIF(technician, '') AS technician, CAST(SUM(record_count) AS SIGNED) AS count FROM maintenance_daily_stats WHERE stat_date BETWEEN %s AND %s"
+    params = [date_from, date_to]
+    if department:
+        sql += " AND department = %s "
+        params.append(department)
+    sql += " GROUP BY technician HAVING count > 0 ORDER BY count DESC"
+    with get_cursor(prepared=True) as cur:
+        cur.execute(sql, params)
         return cur.fetchall()
\ No newline at end of file
@@ -0,0 +1,259 @@
+﻿# db_pool.py
+import random
+import threading
+import time
+from collections import deque, OrderedDict
+import mysql.connector
+from mysql.connector import errorcode
+
+# Errors worth retrying: the server is (re)starting, the link dropped, or it is briefly out of connections.
+TRANSIENT_ERRORS = {
+    errorcode.CR_CONNECTION_ERROR, errorcode.CR_CONN_HOST_ERROR, errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST, errorcode.ER_CON_COUNT_ERROR, errorcode.ER_TOO_MANY_USER_CONNECTIONS,
+}
+
+class PoolTimeout(mysql.connector.errors.PoolError):
+    pass
+
+def is_transient(err):
+    return isinstance(err, mysql.connector.Error) and err.errno in TRANSIENT_ERRORS
+
+class PooledConnection:
+    """Proxy around a MySQL connection; close() hands it back to the pool instead of disconnecting."""
+
+    def __init__(self, pool, cnx):
+        self._pool = pool
+        self._cnx = cnx
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.broken = False # set when the link failed mid-use so release() discards it
+        self._statements = OrderedDict() # sql -> (sql, prepared cursor), least recently used first
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def close(self):
+        self._pool.release(self)
+
+    def disconnect(self):
+        self._statements.clear()
+        try:
+            self._cnx.close()
+        except mysql.connector.Error:
+            pass
+
+    def prepared_cursor(self, sql):
+        """Return (sql, cursor) where cursor holds a server-side prepared statement for sql on this connection.
+        The cursor only skips re-preparing when it is executed with that same sql object, so callers use the returned one."""
+        entry = self._statements.get(sql)
+        if entry is not None:
+            self._statements.move_to_end(sql)
+            return entry
+        entry = self._statements[sql] = (sql, self._cnx.cursor(prepared=True, dictionary=True))
+        if len(self._statements) > self._pool.statement_cache_size:
+            _, (_, oldest) = self._statements.popitem(last=False)
+            try:
+                oldest.close() # deallocates the statement on the server
+            except mysql.connector.Error:
+                pass
+        return entry
+
+class PreparedCursor:
+    """Dict-cursor facade handed out by db_ops.get_cursor(prepared=True). Each statement runs through the
+    connection's prepared statement cache; result rows are read eagerly so the next statement can use the link."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._cursor = None
+        self._rows = deque()
+
+    def execute(self, sql, params=()):
+        sql, self._cursor = self._conn.prepared_cursor(sql)
+        self._cursor.execute(sql, tuple(params))
+        self._rows = deque(self._cursor.fetchall() if self._cursor.with_rows else ())
+
+    def fetchone(self):
+        return self._rows.popleft() if self._rows else None
+
+    def fetchall(self):
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+    @property
+    def description(self):
+        return self._cursor.description if self._cursor else None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount if self._cursor else -1
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid if self._cursor else None
+
+    def close(self):
+        self._rows.clear() # the statements stay prepared on the connection for the next caller
+
+class ConnectionPool:
+    """Elastic connection pool: opens connections on demand up to pool_size, validates them on checkout,
+    queues callers fairly (FIFO) when all are busy, and closes connections idle for longer than idle_timeout
+    until only min_idle remain."""
+
+    def __init__(self, db_config, pool_size=5, min_idle=1, max_lifetime=1800, idle_timeout=300,
+                 acquire_timeout=10, max_waiters=50, validation_interval=5, connect_retries=3, retry_backoff=0.5,
+                 statement_cache_size=64):
+        self.db_config = db_config
+        self.pool_size = pool_size
+        self.min_idle = min(min_idle, pool_size)
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.max_waiters = max_waiters
+        self.validation_interval = validation_interval
+        self.connect_retries = connect_retries
+        self.retry_backoff = retry_backoff
+        self.statement_cache_size = statement_cache_size
+        self._idle = deque() # most recently used on the right
+        self._total = 0
+        self._waiters = deque()
+        self._cond = threading.Condition()
+        self._reaper = None
+
+    # --- Checkout ---
+    def get_connection(self, timeout=None, validate=False):
+        """validate=True pings an idle connection even if it was used recently, e.g. right after another one lost its link."""
+        self._start_reaper()
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        conn = self._acquire(deadline)
+        try:
+            if conn is None:
+                return self._connect()
+            if self._expired(conn):
+                conn.disconnect()
+                return self._connect(reuse=conn)
+            if validate or time.monotonic() - conn.last_used > self.validation_interval:
+                self._validate(conn)
+            return conn
+        except Exception:
+            self._discard()
+            raise
+
+    def _acquire(self, deadline):
+        """Wait for our turn in the queue; returns an idle connection, or None when a new one may be opened."""
+        with self._cond:
+            if len(self._waiters) >= self.max_waiters:
+                raise PoolTimeout("Too many requests are waiting for a database connection.")
+            ticket = object()
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    if self._waiters[0] is ticket:
+                        if self._idle:
+                            return self._idle.pop()
+                        if self._total < self.pool_size:
+                            self._total += 1
+                            return None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No database connection became free within {self.acquire_timeout} seconds.")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def _connect(self, reuse=None):
+        """Open a connection, retrying transient failures with exponential backoff and jitter."""
+        for attempt in range(self.connect_retries + 1):
+            try:
+                cnx = mysql.connector.connect(**self.db_config)
+                break
+            except mysql.connector.Error as err:
+                if not is_transient(err) or attempt == self.connect_retries:
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt) * (0.5 + random.random()))
+        if reuse is not None:
+            reuse._cnx, reuse.created_at, reuse.broken = cnx, time.monotonic(), False
+            reuse._statements.clear()
+            return reuse
+        return PooledConnection(self, cnx)
+
+    def _validate(self, conn):
+        """Ping a connection that sat idle; reconnect transparently if the server dropped it (wait_timeout)."""
+        try:
+            connection_id = conn.connection_id
+            conn.ping(reconnect=True, attempts=self.connect_retries, delay=self.retry_backoff)
+            if conn.connection_id != connection_id:
+                conn._statements.clear() # prepared statements died with the old session
+        except mysql.connector.Error:
+            conn.disconnect()
+            self._connect(reuse=conn)
+
+    def _expired(self, conn):
+        return time.monotonic() - conn.created_at > self.max_lifetime
+
+    def warm(self):
+        """Open connections until min_idle are idle (at least one), so the first real query does not pay for the handshake."""
+        conns = [self.get_connection() for _ in range(max(1, self.min_idle) - len(self._idle))]
+        for conn in conns:
+            conn.close()
+
+    # --- Return ---
+    def release(self, conn):
+        conn.last_used = time.monotonic()
+        if not conn.broken and conn.in_transaction:
+            # A borrower left a transaction open; end it so its snapshot and locks do not pass to the next one.
+            try:
+                conn.rollback()
+            except mysql.connector.Error:
+                conn.broken = True
+        if conn.broken or self._expired(conn):
+            conn.disconnect()
+            self._discard()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify_all()
+
+    def _discard(self):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify_all()
+
+    # --- Idle reaping ---
+    def _start_reaper(self):
+        if self._reaper is None:
+            with self._cond:
+                if self._reaper is None:
+                    self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+                    self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1, min(self.idle_timeout, self.max_lifetime) / 2)
+        while True:
+            time.sleep(interval)
+            self.reap()
+
+    def reap(self):
+        """Close idle connections past idle_timeout (keeping min_idle) or past max_lifetime."""
+        now = time.monotonic()
+        to_close = []
+        with self._cond:
+            keep = deque()
+            # Oldest-used connections are on the left, so they are reaped first.
+            while self._idle:
+                conn = self._idle.popleft()
+                idle_too_long = now - conn.last_used > self.idle_timeout and len(self._idle) + len(keep) >= self.min_idle
+                if idle_too_long or self._expired(conn):
+                    to_close.append(conn)
+                    self._total -= 1
+                else:
+                    keep.append(conn)
+            self._idle = keep
+            self._cond.notify_all()
+        for conn in to_close:
+            conn.disconnect()
+
+    def stats(self):
+        with self._cond:
+            return {'open': self._total, 'idle': len(self._idle), 'in_use': self._total - len(self._idle), 'waiting': len(self._waiters)}
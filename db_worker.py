@@ -0,0 +1,157 @@
+﻿# db_worker.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import db_ops
+
+# One shared thread pool, no larger than the connection pool so background queries never queue for a connection.
+_thread_pool = None
+
+def thread_pool():
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(db_ops.POOL_CONFIG['pool_size'])
+    return _thread_pool
+
+# KILL QUERY must not wait behind the streams it is meant to stop, so cancellations get threads of their own.
+_cancel_pool = None
+
+def cancel_pool():
+    global _cancel_pool
+    if _cancel_pool is None:
+        _cancel_pool = QThreadPool()
+        _cancel_pool.setMaxThreadCount(2)
+    return _cancel_pool
+
+class _CancelTask(QRunnable):
+    def __init__(self, handle):
+        super().__init__()
+        self.handle = handle
+
+    def run(self):
+        self.handle.cancel()
+
+def cancel_query(handle):
+    """Kill the query behind a db_ops.QueryHandle without going through the shared thread pool."""
+    cancel_pool().start(_CancelTask(handle))
+
+class _TaskSignals(QObject):
+    done = pyqtSignal(object, int, bool, object) # key, generation, succeeded, result or exception
+    batch = pyqtSignal(object, int, object) # key, generation, list of rows
+
+class _Task(QRunnable):
+    def __init__(self, signals, key, generation, fn, args, kwargs):
+        super().__init__()
+        self.signals = signals
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            result, succeeded = self.fn(*self.args, **self.kwargs), True
+        except Exception as e:
+            result, succeeded = e, False
+        self._emit(self.signals.done, succeeded, result)
+
+    def _emit(self, signal, *args):
+        try:
+            signal.emit(self.key, self.generation, *args)
+        except RuntimeError:
+            pass # the owning window was destroyed while the query ran
+
+class _StreamTask(_Task):
+    """Iterates fn(*args) and emits the rows in batches; stops early once its call has been superseded."""
+
+    def __init__(self, signals, key, generation, fn, args, kwargs, batch_size, is_current):
+        super().__init__(signals, key, generation, fn, args, kwargs)
+        self.batch_size = batch_size
+        self.is_current = is_current
+
+    def run(self):
+        rows = None
+        count = 0
+        try:
+            rows = self.fn(*self.args, **self.kwargs)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    if not self.is_current():
+                        return
+                    self._emit(self.signals.batch, batch)
+                    count += len(batch)
+                    batch = []
+            if batch and self.is_current():
+                self._emit(self.signals.batch, batch)
+                count += len(batch)
+            self._emit(self.signals.done, True, count)
+        except Exception as e:
+            self._emit(self.signals.done, False, e)
+        finally:
+            if hasattr(rows, 'close'):
+                rows.close() # gives a streaming query's connection back right away
+
+class DbExecutor(QObject):
+    """Runs db_ops calls on the shared thread pool and hands results back on the GUI thread.
+
+    Each call is submitted under a key (e.g. "search"); a newer submit() or cancel() for the same key
+    makes any earlier call with that key stale, and its result is dropped instead of delivered.
+    pool defaults to the shared database thread pool."""
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self._pool = pool
+        self._generations = {}
+        self._callbacks = {}
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, **kwargs):
+        generation, signals = self._next_call(key, on_result, on_error)
+        (self._pool or thread_pool()).start(_Task(signals, key, generation, fn, args, kwargs))
+        return generation
+
+    def submit_stream(self, key, fn, *args, batch_size=50, on_batch=None, on_result=None, on_error=None, **kwargs):
+        """Like submit(), for an fn returning an iterable (e.g. a db_ops.iter_* generator): on_batch receives the rows
+        in lists of batch_size as they arrive, then on_result the number of rows delivered."""
+        generation, signals = self._next_call(key, on_result, on_error, on_batch)
+        generations = self._generations
+        is_current = lambda: generations.get(key) == generation
+        (self._pool or thread_pool()).start(_StreamTask(signals, key, generation, fn, args, kwargs, batch_size, is_current))
+        return generation
+
+    def _next_call(self, key, on_result, on_error, on_batch=None):
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._callbacks[key] = (on_result, on_error, on_batch)
+        signals = _TaskSignals() # created here so its signals are delivered on this (GUI) thread
+        signals.done.connect(self._finished)
+        signals.batch.connect(self._batch)
+        return generation, signals
+
+    def cancel(self, key):
+        """Forget the pending call for key; the query still runs to completion but its result is discarded."""
+        if key in self._callbacks:
+            self._generations[key] += 1
+            del self._callbacks[key]
+
+    def is_running(self, key):
+        return key in self._callbacks
+
+    def _batch(self, key, generation, rows):
+        if self._generations.get(key) == generation and key in self._callbacks:
+            on_batch = self._callbacks[key][2]
+            if on_batch:
+                on_batch(rows)
+
+    def _finished(self, key, generation, succeeded, result):
+        if self._generations.get(key) != generation or key not in self._callbacks:
+            return # superseded by a newer call
+        on_result, on_error, _ = self._callbacks.pop(key)
+        if succeeded:
+            if on_result:
+                on_result(result)
+        elif on_error:
+            on_error(result)
+        else:
+            print(f"Background query '{key}' failed: {result}")
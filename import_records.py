@@ -0,0 +1,77 @@
+﻿# import_records.py
+import csv
+import sys
+from datetime import datetime
+from itertools import islice
+import db_ops
+
+# Column layout of the maintenance table as written by utils.export_to_csv (header row first).
+CSV_COLUMNS = ["id", "date", "type", "device", "technician", "procedures", "materials", "notes", "warnings", "department"]
+REQUIRED_COLUMNS = ("device", "procedures", "department")
+DATE_FORMAT = "%Y-%m-%d"
+
+def iter_csv_batches(path, batch_size=db_ops.IMPORT_CHUNK_SIZE):
+    """Stream (line_number, row) pairs from the CSV in lists of batch_size, skipping the header row."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = enumerate(csv.reader(f), start=1)
+        first = next(rows, None)
+        if first and not (first[1] and first[1][0].strip().isdigit()):
+            first = None # header row
+        batch = [first] if first else []
+        while True:
+            batch.extend(islice(rows, batch_size - len(batch)))
+            if not batch:
+                return
+            yield batch
+            batch = []
+
+def validate_row(row):
+    """Return (record tuple in db_ops.MAINTENANCE_FIELDS order, None) or (None, error message)."""
+    if len(row) != len(CSV_COLUMNS):
+        return None, f"expected {len(CSV_COLUMNS)} columns, found {len(row)}"
+    values = {key: value.strip() for key, value in zip(CSV_COLUMNS, row)}
+    missing = [key for key in REQUIRED_COLUMNS if not values[key]]
+    if missing:
+        return None, f"missing required value(s): {', '.join(missing)}"
+    try:
+        datetime.strptime(values['date'], DATE_FORMAT)
+    except ValueError:
+        return None, f"invalid date '{values['date']}' (expected YYYY-MM-DD)"
+    return tuple(values[key] for key in db_ops.MAINTENANCE_FIELDS), None
+
+def import_csv(path, user_id, batch_size=db_ops.IMPORT_CHUNK_SIZE, progress_callback=None):
+    """Validate and insert the CSV batch by batch. progress_callback(rows_read, imported, rejected) runs after each batch.
+    Returns (imported_count, [(line_number, error), ...])."""
+    rows_read = 0
+    imported = 0
+    errors = []
+    for batch in iter_csv_batches(path, batch_size):
+        valid = []
+        for line_number, row in batch:
+            if not any(cell.strip() for cell in row):
+                continue
+            record, error = validate_row(row)
+            if error:
+                errors.append((line_number, error))
+            else:
+                valid.append(record)
+        if valid:
+            imported += db_ops.insert_records_many(valid, user_id, chunk_size=batch_size)
+        rows_read += len(batch)
+        if progress_callback:
+            progress_callback(rows_read, imported, len(errors))
+    return imported, errors
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python import_records.py <csv_file> <user_id>")
+        sys.exit(1)
+
+    def print_progress(rows_read, imported, rejected):
+        print(f"\rRead {rows_read} rows, imported {imported}, rejected {rejected}", end="", flush=True)
+
+    imported, errors = import_csv(sys.argv[1], int(sys.argv[2]), progress_callback=print_progress)
+    print()
+    for line_number, error in errors:
+        print(f"Line {line_number}: {error}")
+    print(f"Done: {imported} records imported, {len(errors)} rejected.")
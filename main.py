@@ -1,13 +1,36 @@
-﻿# main.py
-import sys
-from PyQt5.QtWidgets import QApplication
-from login_ui import LoginWindow
-from stylesheet import STYLE_SHEET
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyleSheet(STYLE_SHEET)
-    
-    login = LoginWindow()
-    login.show()
+﻿# main.py
+import sys
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from login_ui import LoginWindow
+from stylesheet import STYLE_SHEET
+import db_ops
+
+class StartupSignals(QObject):
+    migration_failed = pyqtSignal(str)
+
+def prepare_database(signals):
+    """Apply pending migrations and open the first pooled connection while the login form is on screen."""
+    import migrations
+    try:
+        migrations.run_migrations()
+    except Exception as e:
+        print(f"Error applying database migrations: {e}")
+        signals.migration_failed.emit(str(e))
+    finally:
+        db_ops.end_schema_upgrade()
+    db_ops.warm_up()
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    app.setStyleSheet(STYLE_SHEET)
+
+    login = LoginWindow()
+    login.show()
+    signals = StartupSignals()
+    signals.migration_failed.connect(lambda error: QMessageBox.critical(
+        login, "خطأ في قاعدة البيانات", f"تعذر تحديث قاعدة البيانات. قد لا تعمل التقارير وحفظ السجلات:\n{error}"))
+    db_ops.begin_schema_upgrade()
+    threading.Thread(target=prepare_database, args=(signals,), name="db-startup", daemon=True).start()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,53 @@
+﻿# migrations/__init__.py
+# Versioned, idempotent schema steps. Each step module defines VERSION, DESCRIPTION and upgrade(cur).
+# Applied versions are recorded in schema_version; run with `python -m migrations` or migrations.run_migrations().
+from . import m0001_fulltext_search, m0002_daily_stats, m0003_hot_path_indexes, m0004_activity_log_indexes, m0005_attachment_content_hash
+
+# Imported explicitly (not discovered) so frozen builds pick every step up.
+STEPS = sorted((m0001_fulltext_search, m0002_daily_stats, m0003_hot_path_indexes, m0004_activity_log_indexes,
+                m0005_attachment_content_hash), key=lambda step: step.VERSION)
+
+def ensure_version_table(cur):
+    cur.execute("CREATE TABLE IF NOT EXISTS schema_version ("
+                "version INT NOT NULL PRIMARY KEY, "
+                "description VARCHAR(255) NOT NULL, "
+                "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+
+def applied_versions(cur):
+    ensure_version_table(cur)
+    cur.execute("SELECT version FROM schema_version")
+    return {row['version'] for row in cur.fetchall()}
+
+def pending_steps(get_cursor):
+    with get_cursor() as cur:
+        done = applied_versions(cur)
+    return [step for step in STEPS if step.VERSION not in done]
+
+MIGRATION_LOCK_TIMEOUT = 600 # seconds to wait for another workstation that is already migrating
+
+def run_migrations(get_cursor=None, log=print, lock_timeout=MIGRATION_LOCK_TIMEOUT):
+    """Apply every pending step in version order and return the versions applied.
+    MySQL commits DDL implicitly, so steps check the live schema and are safe to re-run after a failure.
+    Workstations starting at once take turns through a named server lock; the one that waits then finds
+    the steps already recorded and applies nothing."""
+    if get_cursor is None:
+        from db_ops import get_cursor
+    if not pending_steps(get_cursor):
+        return []
+    applied = []
+    # GET_LOCK belongs to the session, so the lock cursor stays open while the steps run on other connections.
+    with get_cursor() as lock_cur:
+        lock_cur.execute("SELECT GET_LOCK(CONCAT(DATABASE(), '.migrations'), %s) AS acquired", (lock_timeout,))
+        if not lock_cur.fetchone()['acquired']:
+            raise RuntimeError(f"Another workstation is still applying migrations after {lock_timeout} seconds.")
+        try:
+            for step in pending_steps(get_cursor):
+                log(f"Applying migration {step.VERSION:04d}: {step.DESCRIPTION}")
+                with get_cursor() as cur:
+                    step.upgrade(cur)
+                    cur.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)", (step.VERSION, step.DESCRIPTION))
+                applied.append(step.VERSION)
+        finally:
+            lock_cur.execute("SELECT RELEASE_LOCK(CONCAT(DATABASE(), '.migrations'))")
+            lock_cur.fetchall()
+    return applied
@@ -0,0 +1,14 @@
+﻿# migrations/__main__.py
+import sys
+import db_ops
+import migrations
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--status":
+        pending = migrations.pending_steps(db_ops.get_cursor)
+        for step in migrations.STEPS:
+            state = "pending" if step in pending else "applied"
+            print(f"{step.VERSION:04d} {state:8} {step.DESCRIPTION}")
+        sys.exit(0)
+    applied = migrations.run_migrations(db_ops.get_cursor)
+    print(f"Applied {len(applied)} migration(s)." if applied else "Database schema is up to date.")
@@ -0,0 +1,25 @@
+﻿# migrations/helpers.py
+# Schema checks that keep the steps idempotent.
+
+def index_exists(cur, table, index_name):
+    cur.execute("SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1", (table, index_name))
+    return cur.fetchone() is not None
+
+def column_exists(cur, table, column):
+    cur.execute("SELECT 1 FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s LIMIT 1", (table, column))
+    return cur.fetchone() is not None
+
+def index_starting_with(cur, table, columns):
+    """True if some index of table already has columns as its leftmost prefix (so a new one would be redundant)."""
+    cur.execute("SELECT INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX", (table,))
+    indexes = {}
+    for row in cur.fetchall():
+        indexes.setdefault(row['INDEX_NAME'], []).append(row['COLUMN_NAME'])
+    return any(cols[:len(columns)] == list(columns) for cols in indexes.values())
+
+def add_index(cur, table, index_name, columns):
+    if index_exists(cur, table, index_name) or index_starting_with(cur, table, columns):
+        return False
+    cur.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({', '.join(columns)})")
+    return True
@@ -0,0 +1,12 @@
+﻿# migrations/m0001_fulltext_search.py
+from .helpers import index_exists
+
+VERSION = 1
+DESCRIPTION = "ngram FULLTEXT index for db_ops.search_all_fields"
+
+# The ngram parser splits text into 2-character tokens (ngram_token_size), so Arabic words
+# and partial words match without a stemmer. Requires MySQL 5.7.6+ with InnoDB.
+def upgrade(cur):
+    if not index_exists(cur, 'maintenance', 'ft_maintenance_text'):
+        cur.execute("ALTER TABLE maintenance ADD FULLTEXT INDEX ft_maintenance_text "
+                    "(device, procedures, materials, notes, warnings) WITH PARSER ngram")
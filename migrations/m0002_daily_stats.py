@@ -0,0 +1,21 @@
+﻿# migrations/m0002_daily_stats.py
+VERSION = 2
+DESCRIPTION = "maintenance_daily_stats rollup for reports"
+
+# Per-day counts of active records, kept current by the db_ops write functions.
+# NULL department/type/technician values are stored as '' because they are part of the primary key.
+def upgrade(cur):
+    cur.execute("CREATE TABLE IF NOT EXISTS maintenance_daily_stats ("
+                "stat_date DATE NOT NULL, "
+                "department VARCHAR(255) NOT NULL DEFAULT '', "
+                "type VARCHAR(255) NOT NULL DEFAULT '', "
+                "technician VARCHAR(255) NOT NULL DEFAULT '', "
+                "record_count INT NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (stat_date, department, type, technician)"
+                ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci")
+    cur.execute("SELECT 1 FROM maintenance_daily_stats LIMIT 1")
+    if cur.fetchone() is None:
+        # Same backfill as db_ops.rebuild_daily_stats()
+        cur.execute("INSERT INTO maintenance_daily_stats (stat_date, department, type, technician, record_count) "
+                    "SELECT date, COALESCE(department, ''), COALESCE(type, ''), COALESCE(technician, ''), COUNT(*) "
+                    "FROM maintenance WHERE is_deleted = 0 GROUP BY 1, 2, 3, 4")
@@ -0,0 +1,20 @@
+﻿# migrations/m0003_hot_path_indexes.py
+from .helpers import add_index
+
+VERSION = 3
+DESCRIPTION = "composite indexes for the hot list, report, history and attachment queries"
+
+INDEXES = [
+    # fetch_records_page / search: WHERE is_deleted = 0 [AND department = ?] ORDER BY id DESC
+    ('maintenance', 'idx_maintenance_active_department', ('is_deleted', 'department', 'id')),
+    # date-window filters: WHERE is_deleted = 0 AND date >= ? / BETWEEN ? AND ?
+    ('maintenance', 'idx_maintenance_active_date', ('is_deleted', 'date')),
+    # get_history_for_record: WHERE record_type = ? AND record_id = ? ORDER BY timestamp
+    ('activity_log', 'idx_activity_log_record', ('record_type', 'record_id', 'timestamp')),
+    # get_attachments_for_record (a foreign key may already provide this one)
+    ('attachments', 'idx_attachments_maintenance', ('maintenance_id',)),
+]
+
+def upgrade(cur):
+    for table, index_name, columns in INDEXES:
+        add_index(cur, table, index_name, columns)
@@ -0,0 +1,17 @@
+﻿# migrations/m0004_activity_log_indexes.py
+from .helpers import add_index
+
+VERSION = 4
+DESCRIPTION = "indexes for keyset paging and filtering of the activity log"
+
+INDEXES = [
+    # fetch_activity_log_page: ORDER BY timestamp DESC, id DESC with (timestamp, id) < (?, ?)
+    ('activity_log', 'idx_activity_log_timestamp', ('timestamp', 'id')),
+    # the same, filtered by user or by action
+    ('activity_log', 'idx_activity_log_user', ('user_id', 'timestamp', 'id')),
+    ('activity_log', 'idx_activity_log_action', ('action', 'timestamp', 'id')),
+]
+
+def upgrade(cur):
+    for table, index_name, columns in INDEXES:
+        add_index(cur, table, index_name, columns)
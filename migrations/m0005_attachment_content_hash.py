@@ -0,0 +1,12 @@
+﻿# migrations/m0005_attachment_content_hash.py
+from .helpers import add_index, column_exists
+
+VERSION = 5
+DESCRIPTION = "content hash column for deduplicated attachments"
+
+def upgrade(cur):
+    # NULL for attachments stored before the content-addressed store (see attachment_store.py).
+    if not column_exists(cur, 'attachments', 'content_hash'):
+        cur.execute("ALTER TABLE attachments ADD COLUMN content_hash CHAR(64) NULL")
+    # add_attachment_file / delete_attachment look up and lock the other references by hash.
+    add_index(cur, 'attachments', 'idx_attachments_content_hash', ('content_hash',))
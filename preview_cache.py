@@ -0,0 +1,144 @@
+﻿# preview_cache.py
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QThreadPool, Qt
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPixmap
+from db_worker import DbExecutor
+
+PREVIEW_CACHE_DIR = "preview_cache"
+PREVIEW_SIZE = 1600 # longest edge of the image shown in the attachment viewer
+THUMBNAIL_SIZE = 96 # longest edge of the attachment list icons
+MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+JPEG_QUALITY = 85
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+fitz_lock = threading.Lock() # PyMuPDF is not thread-safe; every fitz call goes through this lock
+_render_pool = None
+
+def render_pool():
+    """Thread pool for decoding; kept apart from db_worker's pool so renders never hold up queries."""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = QThreadPool()
+        _render_pool.setMaxThreadCount(2)
+    return _render_pool
+
+def cache_key(path, content_hash=None):
+    """Content hash for files from the attachment store; path, size and mtime for anything else."""
+    if content_hash:
+        return content_hash
+    stat = os.stat(path)
+    return hashlib.sha256(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8')).hexdigest()
+
+def is_previewable(path):
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS + ('.pdf',)
+
+def _disk_path(key, size):
+    return os.path.join(PREVIEW_CACHE_DIR, key[:2], f"{key}_{size}.jpg")
+
+def render(path, size):
+    """Decode path straight to at most size x size pixels (first page for PDFs). Returns a QImage, null on failure."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        import fitz # PyMuPDF is heavy; only load it when a PDF is previewed
+        with fitz_lock:
+            doc = fitz.open(path)
+            try:
+                page = doc.load_page(0)
+                zoom = size / max(page.rect.width, page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                # copy(): the QImage would otherwise point into pix's buffer, which goes away with pix
+                return QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
+            finally:
+                doc.close()
+    reader = QImageReader(path)
+    reader.setAutoTransform(True) # phone photos carry their rotation in EXIF
+    full_size = reader.size()
+    if full_size.isValid() and max(full_size.width(), full_size.height()) > size:
+        # Lets the JPEG decoder skip most of the work instead of decoding every pixel and scaling afterwards.
+        reader.setScaledSize(full_size.scaled(size, size, Qt.KeepAspectRatio))
+    return reader.read()
+
+def load_image(path, key, size):
+    """The size render of path from the disk cache, rendering and storing it first on a miss. Safe on any thread."""
+    cached_path = _disk_path(key, size)
+    if os.path.exists(cached_path):
+        image = QImage(cached_path)
+        if not image.isNull():
+            return image
+    image = render(path, size)
+    if image.isNull():
+        return image
+    if image.hasAlphaChannel(): # JPEG has no alpha; flatten onto white like the viewer background
+        flat = QImage(image.size(), QImage.Format_RGB32)
+        flat.fill(Qt.white)
+        painter = QPainter(flat)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        image = flat
+    os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+    temp = f"{cached_path}.{uuid.uuid4().hex}.tmp"
+    if image.save(temp, "JPG", JPEG_QUALITY):
+        os.replace(temp, cached_path)
+    elif os.path.exists(temp):
+        os.remove(temp)
+    return image
+
+class PreviewCache(QObject):
+    """Preview and thumbnail renders of attachment files: an in-memory LRU of QPixmaps bounded by
+    memory_budget bytes, backed by JPEG renders on disk keyed by cache_key() and size."""
+
+    def __init__(self, memory_budget=MEMORY_BUDGET_BYTES, parent=None):
+        super().__init__(parent)
+        self.memory_budget = memory_budget
+        self._pixmaps = OrderedDict() # (key, size) -> QPixmap
+        self._bytes = 0
+        self.executor = DbExecutor(self, pool=render_pool())
+
+    def cached_pixmap(self, key, size):
+        pixmap = self._pixmaps.get((key, size))
+        if pixmap is not None:
+            self._pixmaps.move_to_end((key, size))
+        return pixmap
+
+    def _store(self, key, size, pixmap):
+        old = self._pixmaps.pop((key, size), None)
+        if old is not None:
+            self._bytes -= self._cost(old)
+        self._pixmaps[(key, size)] = pixmap
+        self._bytes += self._cost(pixmap)
+        while self._bytes > self.memory_budget and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def request(self, path, key, size, on_ready, task_key=None):
+        """Call on_ready(pixmap) with the size render of path: right away from memory, otherwise once it has been
+        loaded from disk or rendered in the background. A newer request with the same task_key supersedes this one."""
+        pixmap = self.cached_pixmap(key, size)
+        if pixmap is not None:
+            self.executor.cancel(task_key or (key, size))
+            on_ready(pixmap)
+            return
+        def loaded(image):
+            if image.isNull():
+                return
+            pixmap = QPixmap.fromImage(image)
+            self._store(key, size, pixmap)
+            on_ready(pixmap)
+        self.executor.submit(task_key or (key, size), load_image, path, key, size, on_result=loaded,
+                             on_error=lambda error: print(f"Preview of {path} failed: {error}"))
+
+    def cancel(self, task_key):
+        self.executor.cancel(task_key)
+
+    def prefetch(self, sources, size, on_ready):
+        """Load the size renders of (path, key) pairs, e.g. a record's attachments, calling on_ready(key, pixmap) for each."""
+        for path, key in sources:
+            self.request(path, key, size, lambda pixmap, key=key: on_ready(key, pixmap))
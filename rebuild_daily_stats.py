@@ -0,0 +1,9 @@
+﻿# rebuild_daily_stats.py
+import db_ops
+
+# One-off helper: (re)fill maintenance_daily_stats from the maintenance table.
+# Migration 0002 backfills the table once; run this again if the rollup is ever suspected to be off.
+
+if __name__ == "__main__":
+    groups = db_ops.rebuild_daily_stats()
+    print(f"Rebuilt maintenance_daily_stats: {groups} (date, department, type, technician) groups.")
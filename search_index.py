@@ -0,0 +1,241 @@
+﻿# search_index.py
+import gzip
+import json
+import os
+import re
+import bisect
+import threading
+from contextlib import contextmanager
+
+TEXT_FIELDS = ("device", "procedures", "materials", "notes", "warnings")
+INDEX_FORMAT_VERSION = 2 # 2: last_record_id is only advanced by sync, not by local edits
+
+# --- Arabic normalization ---
+_TASHKEEL = re.compile('[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED]')
+_LETTER_MAP = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', # alef variants
+    'ة': 'ه',                                # taa marbuta -> haa
+    'ى': 'ي',                                # alef maqsura -> yaa
+    'ـ': None,                               # tatweel
+})
+_TOKEN = re.compile(r'\w+')
+
+def normalize(text):
+    return _TASHKEEL.sub('', text or '').translate(_LETTER_MAP).lower()
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+def record_terms(record):
+    terms = set()
+    for field in TEXT_FIELDS:
+        terms.update(tokenize(record.get(field)))
+    return terms
+
+class SearchIndex:
+    """Inverted index (term -> posting set of record ids) over the maintenance text columns, persisted as gzipped JSON."""
+
+    def __init__(self, path, autosave_delay=30.0):
+        self.path = path
+        self.autosave_delay = autosave_delay
+        self.last_log_id = None # newest activity_log id already reflected in the index
+        self.last_record_id = 0 # highest maintenance id read by a sync or rebuild; rows above it are new
+        self._postings = {}
+        self._doc_terms = {}
+        self._sorted_terms = None
+        self._pending_changes = 0
+        self._bulk_depth = 0
+        self._save_timer = None
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock() # one writer of the file at a time
+
+    @property
+    def is_built(self):
+        self._ensure_loaded()
+        return self.last_log_id is not None
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return # a corrupt index is rebuilt from the database on next sync
+            if data.get('version') != INDEX_FORMAT_VERSION:
+                return
+            self.last_log_id = data.get('last_log_id')
+            self.last_record_id = data.get('last_record_id', 0)
+            for term, ids in data.get('postings', {}).items():
+                self._postings[term] = set(ids)
+                for record_id in ids:
+                    self._doc_terms.setdefault(record_id, set()).add(term)
+
+    def save(self):
+        """Write the index if it has unsaved changes. Only the snapshot is taken under the lock, so edits and
+        searches are not held up while the file is written."""
+        with self._save_lock:
+            with self._lock:
+                self._cancel_autosave()
+                if not self._loaded or not self._pending_changes:
+                    return
+                postings = {term: list(ids) for term, ids in self._postings.items()}
+                data = {
+                    'version': INDEX_FORMAT_VERSION,
+                    'last_log_id': self.last_log_id,
+                    'last_record_id': self.last_record_id,
+                }
+                self._pending_changes = 0
+            try:
+                data['postings'] = {term: sorted(ids) for term, ids in postings.items()}
+                tmp_path = self.path + '.tmp'
+                with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving search index: {e}")
+                with self._lock:
+                    self._pending_changes += 1 # try again with the next save
+
+    def _changed(self):
+        self._pending_changes += 1
+        if not self._bulk_depth:
+            self._schedule_autosave()
+
+    def _schedule_autosave(self):
+        # Saved from a timer thread autosave_delay seconds after the first unsaved edit (and at exit, see db_ops),
+        # never on the thread making the edit: a save rewrites the whole file.
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.autosave_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _cancel_autosave(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+    @contextmanager
+    def bulk(self):
+        """Hold back autosave during many add()/remove() calls; the changes are saved together afterwards."""
+        with self._lock:
+            self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._bulk_depth -= 1
+                if not self._bulk_depth and self._pending_changes:
+                    self._schedule_autosave()
+
+    def mark_synced(self, last_log_id, last_record_id):
+        """Record that every activity_log entry up to last_log_id and every row up to last_record_id is reflected.
+        Local add() calls do not move last_record_id: another client's rows below a local insert would be skipped."""
+        with self._lock:
+            self.last_log_id = last_log_id
+            self.last_record_id = max(self.last_record_id, last_record_id)
+            self._changed()
+
+    def reset(self):
+        """Forget every record and delete the file, e.g. after the database was restored from a backup.
+        is_built is False afterwards, so the next db_ops.sync_search_index() rebuilds from the database."""
+        with self._save_lock, self._lock:
+            self._cancel_autosave()
+            self._loaded = True
+            self._postings = {}
+            self._doc_terms = {}
+            self._sorted_terms = None
+            self._pending_changes = 0
+            self.last_log_id = None
+            self.last_record_id = 0
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _remove_terms(self, record_id):
+        for term in self._doc_terms.pop(record_id, ()):
+            ids = self._postings.get(term)
+            if ids is None:
+                continue
+            ids.discard(record_id)
+            if not ids:
+                del self._postings[term]
+                self._sorted_terms = None
+
+    def add(self, record_id, record):
+        """Index (or re-index) one record given as a dict holding the TEXT_FIELDS."""
+        self._ensure_loaded()
+        with self._lock:
+            self._remove_terms(record_id)
+            terms = record_terms(record)
+            for term in terms:
+                ids = self._postings.get(term)
+                if ids is None:
+                    ids = self._postings[term] = set()
+                    self._sorted_terms = None
+                ids.add(record_id)
+            self._doc_terms[record_id] = terms
+            self._changed()
+
+    def remove(self, record_id):
+        self._ensure_loaded()
+        with self._lock:
+            if record_id in self._doc_terms:
+                self._remove_terms(record_id)
+                self._changed()
+
+    def rebuild(self, records, last_log_id):
+        """Replace the whole index with the given records (dicts with an 'id' key). The new index is built
+        without the lock, so searches keep using the old one until it is swapped in. Edits made meanwhile are
+        logged after last_log_id, so the next sync applies them again."""
+        postings, doc_terms, last_record_id = {}, {}, 0
+        for record in records:
+            terms = record_terms(record)
+            for term in terms:
+                postings.setdefault(term, set()).add(record['id'])
+            doc_terms[record['id']] = terms
+            last_record_id = max(last_record_id, record['id'])
+        with self._lock:
+            self._loaded = True
+            self._postings = postings
+            self._doc_terms = doc_terms
+            self._sorted_terms = None
+            self.last_record_id = last_record_id
+            self.last_log_id = last_log_id
+            self._pending_changes += 1
+        self.save()
+
+    def _prefix_matches(self, prefix):
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        matches = set()
+        terms = self._sorted_terms
+        position = bisect.bisect_left(terms, prefix)
+        while position < len(terms) and terms[position].startswith(prefix):
+            matches |= self._postings[terms[position]]
+            position += 1
+        return matches
+
+    def search(self, query, prefix_last=True):
+        """Return ids of records containing every term of query, newest first.
+        A term ending in '*' is a prefix term; with prefix_last the final term is always one (search-as-you-type)."""
+        self._ensure_loaded()
+        raw_terms = query.split()
+        if not raw_terms:
+            return []
+        with self._lock:
+            result = None
+            for position, raw in enumerate(raw_terms):
+                is_prefix = raw.endswith('*') or (prefix_last and position == len(raw_terms) - 1)
+                for term in tokenize(raw):
+                    ids = self._prefix_matches(term) if is_prefix else self._postings.get(term, set())
+                    result = set(ids) if result is None else result & ids
+                    if not result:
+                        return []
+            return sorted(result or (), reverse=True)
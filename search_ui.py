@@ -1,108 +1,162 @@
-﻿# search_ui.py
-from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox, QDialog, QTextEdit, QStatusBar, QHBoxLayout
-)
-from PyQt5.QtCore import Qt
-import db_ops
-import utils
-
-class SearchWindow(QWidget):
-    MAX_CELL_TEXT_LENGTH = 50
-
-    def __init__(self, user_role="user", user_department=None):
-        super().__init__()
-        self.setWindowTitle("بحث شامل في السجلات")
-        self.setGeometry(150, 150, 1000, 700)
-        self.setLayoutDirection(Qt.RightToLeft)
-        self.user_role = user_role
-        self.user_department = user_department
-        
-        main_layout = QVBoxLayout(self)
-
-        # --- Simplified Search Input ---
-        search_layout = QHBoxLayout()
-        search_layout.addWidget(QLabel("ابحث عن أي كلمة:"))
-        self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("اكتب هنا للبحث في جميع الحقول...")
-        search_layout.addWidget(self.search_input)
-        
-        btn_search = QPushButton("بحث")
-        btn_search.clicked.connect(self.perform_search)
-        search_layout.addWidget(btn_search)
-
-        main_layout.addLayout(search_layout)
-
-        # --- Results Table ---
-        self.table = QTableWidget()
-        self.table.verticalHeader().setVisible(False)
-        self.table.setColumnCount(10)
-        self.table.setHorizontalHeaderLabels(["ID", "التاريخ", "النوع", "الجهاز", "الفني", "الإجراءات", "المواد", "ملاحظات", "التحذيرات", "القسم"])
-        self.table.cellDoubleClicked.connect(self.show_full_details)
-        main_layout.addWidget(self.table)
-
-        # --- Status Bar ---
-        self.status_bar = QStatusBar()
-        main_layout.addWidget(self.status_bar)
-
-        self.perform_search() # Perform an initial search to show all records
-
-    def perform_search(self):
-        self.status_bar.showMessage("جاري البحث...")
-        
-        keyword = self.search_input.text().strip()
-        
-        department_filter = None
-        if self.user_role != 'admin' or self.user_department:
-            department_filter = self.user_department
-
-        results = db_ops.search_all_fields(keyword, department_filter)
-        
-        self.table.setRowCount(len(results))
-        for row_idx, row_data in enumerate(results):
-            for col_idx, key in enumerate(["id", "date", "type", "device", "technician", "procedures", "materials", "notes", "warnings", "department"]):
-                value = row_data.get(key, "")
-                display_text = str(value) if value else ""
-                if len(display_text) > self.MAX_CELL_TEXT_LENGTH:
-                    display_text = display_text[:self.MAX_CELL_TEXT_LENGTH] + "..."
-                item = QTableWidgetItem(display_text)
-                if value:
-                    item.setData(Qt.UserRole, str(value))
-                self.table.setItem(row_idx, col_idx, item)
-        
-        self.status_bar.showMessage(f"تم العثور على {len(results)} سجل.", 5000)
-
-    def show_full_details(self, row, col):
-        try:
-            record_id = self.table.item(row, 0).text()
-            def get_full_text(col_index):
-                item = self.table.item(row, col_index)
-                if item:
-                    full_text = item.data(Qt.UserRole)
-                    return full_text if full_text is not None else item.text()
-                return ""
-            details_content = f"""
-                <b>المعرف:</b> {record_id}<br>
-                <b>التاريخ:</b> {get_full_text(1)}<br>
-                <b>النوع:</b> {get_full_text(2)}<br>
-                <b>الجهاز:</b> {get_full_text(3)}<br>
-                <b>الفني:</b> {get_full_text(4)}<br>
-                <b>القسم:</b> {get_full_text(9)}<br><br>
-                <b>الإجراءات المتبعة:</b><br>{get_full_text(5) or 'لا توجد'}<br><br>
-                <b>المواد المستخدمة:</b><br>{get_full_text(6) or 'لا توجد'}<br><br>
-                <b>ملاحظات:</b><br>{get_full_text(7) or 'لا توجد'}<br><br>
-                <b>تحذيرات:</b><br>{get_full_text(8) or 'لا توجد'}<br>
-            """
-            details_dialog = QDialog(self)
-            details_dialog.setWindowTitle(f"تفاصيل السجل - ID: {record_id}")
-            details_dialog.setLayoutDirection(Qt.RightToLeft)
-            layout = QVBoxLayout()
-            details_text = QTextEdit()
-            details_text.setReadOnly(True)
-            details_text.setHtml(details_content)
-            layout.addWidget(details_text)
-            details_dialog.setLayout(layout)
-            details_dialog.resize(600, 400)
-            details_dialog.exec_()
-        except Exception as e:
+﻿# search_ui.py
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+    QMessageBox, QDialog, QTextEdit, QStatusBar, QHBoxLayout
+)
+from PyQt5.QtCore import Qt, QTimer, QSettings
+import db_ops
+import utils
+from db_worker import DbExecutor, cancel_query
+
+SEARCH_PAGE_SIZE = 200 # rows per search request; "load more" fetches the next page
+DEFAULT_SEARCH_DEBOUNCE_MS = 300
+RESULT_COLUMNS = ["id", "date", "type", "device", "technician", "procedures", "materials", "notes", "warnings", "department"]
+
+class SearchWindow(QWidget):
+    def __init__(self, user_role="user", user_department=None):
+        super().__init__()
+        self.setWindowTitle("بحث شامل في السجلات")
+        self.setGeometry(150, 150, 1000, 700)
+        self.setLayoutDirection(Qt.RightToLeft)
+        self.user_role = user_role
+        self.user_department = user_department
+        self.executor = DbExecutor(self)
+        self.query_handle = None # lets a superseded search be killed on the server
+        self.search_keyword = ""
+        
+        main_layout = QVBoxLayout(self)
+
+        # --- Simplified Search Input ---
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("ابحث عن أي كلمة:"))
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("اكتب هنا للبحث في جميع الحقول...")
+        self.search_input.textChanged.connect(self.schedule_search)
+        self.search_input.returnPressed.connect(self.perform_search)
+        search_layout.addWidget(self.search_input)
+
+        # Typing restarts the timer; the search runs once the user pauses.
+        settings = QSettings("MyCompany", "MaintenanceApp")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(settings.value("search_debounce_ms", DEFAULT_SEARCH_DEBOUNCE_MS, type=int))
+        self.search_timer.timeout.connect(self.perform_search)
+        
+        btn_search = QPushButton("بحث")
+        btn_search.clicked.connect(self.perform_search)
+        search_layout.addWidget(btn_search)
+
+        main_layout.addLayout(search_layout)
+
+        # --- Results Table ---
+        self.table = QTableWidget()
+        self.table.verticalHeader().setVisible(False)
+        self.table.setColumnCount(10)
+        self.table.setHorizontalHeaderLabels(["ID", "التاريخ", "النوع", "الجهاز", "الفني", "الإجراءات", "المواد", "ملاحظات", "التحذيرات", "القسم"])
+        self.table.cellDoubleClicked.connect(self.show_full_details)
+        main_layout.addWidget(self.table)
+
+        self.btn_load_more = QPushButton("تحميل المزيد")
+        self.btn_load_more.clicked.connect(self.load_more)
+        self.btn_load_more.setVisible(False)
+        main_layout.addWidget(self.btn_load_more)
+
+        # --- Status Bar ---
+        self.status_bar = QStatusBar()
+        main_layout.addWidget(self.status_bar)
+        self.status_bar.showMessage("اكتب كلمة للبحث أو اضغط بحث لعرض أحدث السجلات.")
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def department_filter(self):
+        if self.user_role != 'admin' or self.user_department:
+            return self.user_department
+        return None
+
+    def perform_search(self):
+        self.search_timer.stop()
+        self.search_keyword = self.search_input.text().strip()
+        self.table.setRowCount(0)
+        self.start_search(offset=0)
+
+    def load_more(self):
+        self.start_search(offset=self.table.rowCount())
+
+    def start_search(self, offset):
+        # Only one scan at a time: the previous one is killed on the server and its late rows are dropped.
+        self.cancel_running_search()
+        self.status_bar.showMessage("جاري البحث...")
+        self.btn_load_more.setVisible(False)
+        self.query_handle = db_ops.QueryHandle()
+        self.executor.submit_stream("search", db_ops.iter_search_all_fields, self.search_keyword, self.department_filter(),
+                                    SEARCH_PAGE_SIZE, offset, handle=self.query_handle,
+                                    on_batch=self.append_results, on_result=self.search_finished, on_error=self.search_failed)
+
+    def cancel_running_search(self):
+        if self.query_handle is not None and self.executor.is_running("search"):
+            self.executor.cancel("search")
+            cancel_query(self.query_handle)
+        self.query_handle = None
+
+    def append_results(self, rows):
+        first_row = self.table.rowCount()
+        self.table.setRowCount(first_row + len(rows))
+        for row_idx, row_data in enumerate(rows, start=first_row):
+            # Long text columns arrive as server-side snippets; show_full_details loads the full record.
+            for col_idx, key in enumerate(RESULT_COLUMNS):
+                value = row_data.get(key, "")
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value) if value else ""))
+        self.status_bar.showMessage(f"جاري البحث... {self.table.rowCount()} سجل حتى الآن")
+
+    def search_finished(self, count):
+        self.query_handle = None
+        # A full page means there may be more matches beyond the limit.
+        self.btn_load_more.setVisible(count == SEARCH_PAGE_SIZE)
+        self.status_bar.showMessage(f"تم العثور على {self.table.rowCount()} سجل.", 5000)
+
+    def search_failed(self, error):
+        self.query_handle = None
+        self.status_bar.showMessage("فشل البحث.", 5000)
+        QMessageBox.critical(self, "خطأ", f"فشل في البحث:\n{str(error)}")
+
+    def closeEvent(self, event):
+        self.search_timer.stop()
+        self.cancel_running_search()
+        super().closeEvent(event)
+
+    def show_full_details(self, row, col):
+        try:
+            record_id = self.table.item(row, 0).text()
+            record = db_ops.get_record(int(record_id))
+            if not record:
+                QMessageBox.warning(self, "تنبيه", "لم يعد هذا السجل موجوداً.")
+                return
+            def get_full_text(key):
+                value = record.get(key)
+                return str(value) if value else ""
+            details_content = f"""
+                <b>المعرف:</b> {record_id}<br>
+                <b>التاريخ:</b> {get_full_text('date')}<br>
+                <b>النوع:</b> {get_full_text('type')}<br>
+                <b>الجهاز:</b> {get_full_text('device')}<br>
+                <b>الفني:</b> {get_full_text('technician')}<br>
+                <b>القسم:</b> {get_full_text('department')}<br><br>
+                <b>الإجراءات المتبعة:</b><br>{get_full_text('procedures') or 'لا توجد'}<br><br>
+                <b>المواد المستخدمة:</b><br>{get_full_text('materials') or 'لا توجد'}<br><br>
+                <b>ملاحظات:</b><br>{get_full_text('notes') or 'لا توجد'}<br><br>
+                <b>تحذيرات:</b><br>{get_full_text('warnings') or 'لا توجد'}<br>
+            """
+            details_dialog = QDialog(self)
+            details_dialog.setWindowTitle(f"تفاصيل السجل - ID: {record_id}")
+            details_dialog.setLayoutDirection(Qt.RightToLeft)
+            layout = QVBoxLayout()
+            details_text = QTextEdit()
+            details_text.setReadOnly(True)
+            details_text.setHtml(details_content)
+            layout.addWidget(details_text)
+            details_dialog.setLayout(layout)
+            details_dialog.resize(600, 400)
+            details_dialog.exec_()
+        except Exception as e:
             QMessageBox.critical(self, "خطأ", f"فشل في عرض التفاصيل الكاملة:\n{str(e)}")
\ No newline at end of file
@@ -0,0 +1,260 @@
+﻿# tiled_viewer.py
+import math
+import os
+import threading
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize, QTimer
+from PyQt5.QtGui import QBrush, QImage, QImageIOHandler, QImageReader, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene
+from db_worker import DbExecutor
+import preview_cache
+
+TILE_SIZE = 512 # device pixels per tile edge
+PAGE_GAP = 16 # scene units between PDF pages
+BASE_EDGE = 1024 # longest edge of the low-resolution render kept under each page's tiles
+MAX_PDF_SCALE = 8.0 # 576 dpi
+NEARBY_PAGES = 2 # page base renders kept above and below the visible pages
+UPDATE_DELAY_MS = 50 # coalesces scroll and zoom steps before tiles are requested
+
+def pyramid_level(scale, max_scale):
+    """The power-of-two render scale at or above scale, so tiles are never stretched on screen."""
+    return min(2.0 ** math.ceil(math.log2(max(scale, 1e-3))), max_scale)
+
+def wants_tiles(path):
+    """True for files the plain preview cannot do justice: every PDF (it has more than page 0) and images
+    larger than the preview render."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        return True
+    size = QImageReader(path).size()
+    return ext in preview_cache.IMAGE_EXTENSIONS and size.isValid() and max(size.width(), size.height()) > preview_cache.PREVIEW_SIZE
+
+class PdfSource:
+    """Pages of a PDF in points. The document stays open for the tile renders, always under preview_cache.fitz_lock."""
+    max_scale = MAX_PDF_SCALE
+
+    def __init__(self, path):
+        import fitz # PyMuPDF is heavy; only load it when a PDF is previewed
+        self._fitz = fitz
+        with preview_cache.fitz_lock:
+            self._doc = fitz.open(path)
+            self.page_sizes = [(page.rect.width, page.rect.height) for page in self._doc]
+
+    def render(self, page, scale, clip):
+        """clip (page units) of page, rendered at scale, as a QImage."""
+        with preview_cache.fitz_lock:
+            if self._doc is None:
+                return QImage()
+            rect = self._fitz.Rect(clip.left(), clip.top(), clip.right(), clip.bottom())
+            pix = self._doc.load_page(page).get_pixmap(matrix=self._fitz.Matrix(scale, scale), clip=rect, alpha=False)
+            return QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
+
+    def close(self):
+        with preview_cache.fitz_lock:
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+
+class ImageSource:
+    """One large image as a single page in pixels. Formats whose decoder can clip (JPEG) decode each tile on its own;
+    the others decode one pyramid level at a time and cut the tiles out of it."""
+    max_scale = 1.0 # never above the image's own resolution
+
+    def __init__(self, path):
+        self.path = path
+        reader = QImageReader(path)
+        self._raw_size = reader.size()
+        rotated = bool(reader.transformation() & QImageIOHandler.TransformationRotate90)
+        width, height = self._raw_size.width(), self._raw_size.height()
+        self.page_sizes = [(height, width) if rotated else (width, height)]
+        # Clipping happens before the EXIF rotation is applied, so rotated images use the level path.
+        self._clips = reader.supportsOption(QImageIOHandler.ScaledClipRect) and reader.transformation() == QImageIOHandler.TransformationNone
+        self._level = None # (scale, QImage) of the last decoded level
+        self._lock = threading.Lock()
+
+    def _scaled_reader(self, scale):
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        reader.setScaledSize(QSize(max(1, round(self._raw_size.width() * scale)), max(1, round(self._raw_size.height() * scale))))
+        return reader
+
+    def render(self, page, scale, clip):
+        target = QRect(round(clip.left() * scale), round(clip.top() * scale), max(1, round(clip.width() * scale)), max(1, round(clip.height() * scale)))
+        if self._clips:
+            reader = self._scaled_reader(scale)
+            reader.setScaledClipRect(target)
+            return reader.read()
+        with self._lock:
+            if self._level is None or self._level[0] != scale:
+                self._level = (scale, self._scaled_reader(scale).read())
+            return self._level[1].copy(target)
+
+    def close(self):
+        with self._lock:
+            self._level = None
+
+def open_source(path):
+    return PdfSource(path) if os.path.splitext(path)[1].lower() == '.pdf' else ImageSource(path)
+
+class TiledViewer(QGraphicsView):
+    """Zoomable, draggable attachment viewer.
+
+    show_pixmap() shows one ready-made pixmap. open_document() lays out all pages of a PDF, or one large image,
+    as blank pages and fills in what scrolls into view: a low-resolution base render per page, then tiles rendered
+    on the preview_cache pool at the power-of-two level of the current zoom. Tiles and page bases that leave the
+    view are dropped, as are queued renders nobody wants any more."""
+
+    def __init__(self, parent=None):
+        self._scene = QGraphicsScene()
+        super().__init__(self._scene, parent)
+        self._scene.setParent(self)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
+        self.executor = DbExecutor(self, pool=preview_cache.render_pool())
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(UPDATE_DELAY_MS)
+        self.update_timer.timeout.connect(self.update_tiles)
+        self.horizontalScrollBar().valueChanged.connect(self.schedule_update)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_update)
+        self._generation = 0
+        self._source = None
+        self._pages = [] # scene rect of every page
+        self._items = {} # render key -> QGraphicsPixmapItem
+        self._wanted = set() # render keys worth drawing; read by the render threads to skip stale work
+        self._level = None
+
+    # --- Content ---
+    def clear(self):
+        self._generation += 1
+        self._wanted = set()
+        self.update_timer.stop()
+        if self._source is not None:
+            self._source.close()
+        self._source = None
+        self._pages = []
+        self._items = {}
+        self._level = None
+        self._scene.clear()
+        self._scene.setSceneRect(QRectF())
+
+    def show_pixmap(self, pixmap):
+        self.clear()
+        self._scene.addPixmap(pixmap).setTransformationMode(Qt.SmoothTransformation)
+        self.fit()
+
+    def open_document(self, path, preview=None):
+        """Show path tiled. preview (e.g. the preview_cache render of page 0) is shown right away and
+        kept as page 0's base render."""
+        if preview is not None:
+            self.show_pixmap(preview)
+        else:
+            self.clear()
+        generation = self._generation
+        self.executor.submit("open", open_source, path, on_result=lambda source: self._layout(generation, source, preview),
+                             on_error=lambda error: print(f"Tiled view of {path} failed: {error}"))
+
+    def _layout(self, generation, source, preview):
+        if generation != self._generation:
+            source.close() # another file was selected while this one opened
+            return
+        self._scene.clear()
+        self._source = source
+        width = max(page_width for page_width, _ in source.page_sizes)
+        y = 0.0
+        for page_width, page_height in source.page_sizes:
+            rect = QRectF((width - page_width) / 2, y, page_width, page_height)
+            self._scene.addRect(rect, QPen(Qt.NoPen), QBrush(Qt.white))
+            self._pages.append(rect)
+            y += page_height + PAGE_GAP
+        self._scene.setSceneRect(QRectF(0, 0, width, y - PAGE_GAP))
+        if preview is not None:
+            key = self._base_key(0)
+            self._wanted.add(key)
+            self._place(key, self._pages[0], preview, z=1)
+        self.fit()
+        self.update_tiles()
+
+    # --- View ---
+    def fit(self):
+        if self._pages:
+            self.fitInView(self._pages[0], Qt.KeepAspectRatio)
+        elif self._scene.items():
+            self.fitInView(self._scene.itemsBoundingRect(), Qt.KeepAspectRatio)
+        self.schedule_update()
+
+    def zoom(self, factor):
+        self.scale(factor, factor)
+        self.schedule_update()
+
+    def wheelEvent(self, event):
+        self.zoom(1.25 if event.angleDelta().y() > 0 else 0.8)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_update()
+
+    def schedule_update(self, *args):
+        if self._source is not None:
+            self.update_timer.start()
+
+    # --- Tiles ---
+    def _base_key(self, page):
+        return (self._generation, page, 'base')
+
+    def _base_scale(self, page):
+        page_width, page_height = self._source.page_sizes[page]
+        return min(self._source.max_scale, BASE_EDGE / max(page_width, page_height))
+
+    def update_tiles(self):
+        """Request the base renders and tiles the current view needs and drop the ones it no longer shows."""
+        if self._source is None:
+            return
+        level = pyramid_level(self.transform().m11() * self.devicePixelRatioF(), self._source.max_scale)
+        tile = TILE_SIZE / level # tile edge in scene units
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        area = visible.adjusted(-tile, -tile, tile, tile) # one tile of margin so short scrolls find tiles ready
+        pages = [page for page, rect in enumerate(self._pages) if rect.intersects(area)]
+        wanted = []
+        if pages:
+            for page in range(max(0, pages[0] - NEARBY_PAGES), min(len(self._pages), pages[-1] + NEARBY_PAGES + 1)):
+                wanted.append((self._base_key(page), QRectF(0, 0, *self._source.page_sizes[page]), self._base_scale(page), 1))
+        for page in pages:
+            if level <= self._base_scale(page):
+                continue # the base render is already sharp at this zoom
+            rect = self._pages[page]
+            bounds = QRectF(0, 0, rect.width(), rect.height())
+            region = area.intersected(rect).translated(-rect.topLeft())
+            for ty in range(int(region.top() // tile), int(math.ceil(region.bottom() / tile))):
+                for tx in range(int(region.left() // tile), int(math.ceil(region.right() / tile))):
+                    clip = QRectF(tx * tile, ty * tile, tile, tile).intersected(bounds)
+                    wanted.append(((self._generation, page, level, tx, ty), clip, level, 2))
+        self._wanted = {key for key, _, _, _ in wanted}
+        self._level = level
+        for key in [key for key in self._items if key not in self._wanted]:
+            self._scene.removeItem(self._items.pop(key))
+        for key, clip, scale, z in wanted:
+            if key in self._items or self.executor.is_running(key):
+                continue
+            self.executor.submit(key, self._render, self._source, key, clip, scale,
+                                 on_result=lambda image, key=key, clip=clip, z=z: self._tile_ready(key, clip, image, z))
+
+    def _render(self, source, key, clip, scale):
+        if key not in self._wanted:
+            return None # scrolled or zoomed away while queued
+        return source.render(key[1], scale, clip)
+
+    def _tile_ready(self, key, clip, image, z):
+        if image is None or image.isNull() or key not in self._wanted:
+            return
+        page_rect = self._pages[key[1]]
+        self._place(key, clip.translated(page_rect.topLeft()), QPixmap.fromImage(image), z)
+
+    def _place(self, key, rect, pixmap, z):
+        item = self._scene.addPixmap(pixmap)
+        item.setTransformationMode(Qt.SmoothTransformation)
+        item.setPos(rect.topLeft())
+        item.setScale(rect.width() / pixmap.width())
+        item.setZValue(z)
+        self._items[key] = item